@@ -0,0 +1,274 @@
+import numpy as np
+
+from instrumentation import instruments
+from scoring_engine import STAT_KEY_MAP, SET_KEY_MAP, SLOT_KEY_MAP, parse_good_artifact
+
+# GOOD artifact fields stored as columns, in GOOD export order
+GOOD_FIELDS = ('setKey', 'rarity', 'level', 'slotKey', 'mainStatKey', 'substats', 'location', 'lock', 'id')
+
+# Types of the scalar GOOD fields kept in columns; other values go to extras
+FIELD_TYPES = {
+    'setKey': str, 'rarity': int, 'level': int, 'slotKey': str,
+    'mainStatKey': str, 'location': str, 'lock': bool, 'id': str
+}
+
+# Per-artifact NumPy columns, in constructor order
+ARRAY_FIELDS = (
+    'set_codes', 'slot_codes', 'main_codes', 'sub_codes', 'sub_values', 'sub_is_int',
+    'sub_lengths', 'levels', 'rarities', 'locks', 'location_codes', 'ids'
+)
+
+# GOOD pads artifacts to four substat entries
+SUBSTAT_WIDTH = 4
+
+# Fields parse_good_artifact cannot do without
+REQUIRED_FIELDS = ('setKey', 'slotKey', 'mainStatKey', 'substats')
+
+
+def code_dtype(vocabulary):
+    """Smallest unsigned integer type that can index a vocabulary."""
+    return np.uint8 if len(vocabulary) <= 256 else np.uint16
+
+
+def is_number(value):
+    """True for the int and float values the substat arrays can hold (bool excluded)."""
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+def ids_array(ids):
+    """Store ids as one byte per character when they are ASCII, as GOOD ids are."""
+    try:
+        return np.array([artifact_id.encode('ascii') for artifact_id in ids], dtype=bytes)
+    except UnicodeEncodeError:
+        return np.array(ids, dtype=str)
+
+
+class ArtifactColumns:
+    """A compact struct-of-arrays inventory that converts losslessly to and from GOOD.
+
+    Set, slot, stat and location keys are stored as small integer codes
+    into per-inventory vocabularies of GOOD keys, and substats as fixed-width
+    code and value arrays (sub_lengths holds how many entries each artifact
+    really had, placeholders included). Fields outside the usual GOOD
+    layout are kept sparsely in extras and missing, so to_good() returns
+    exactly what was read.
+
+    Rows read like the calculator's artifact dicts through artifact(row),
+    indexing and iteration, and ScoringEngine scores an ArtifactColumns
+    directly from its arrays without building those dicts. Rows missing a
+    required GOOD field are left out of both iteration and scoring, so
+    scoring the columns lines up row by row with scoring list(columns).
+    """
+
+    def __init__(self, set_keys, slot_keys, stat_keys, locations, set_codes, slot_codes, main_codes,
+                 sub_codes, sub_values, sub_is_int, sub_lengths, levels, rarities, locks,
+                 location_codes, ids, extras=None, missing=None):
+        # Vocabularies of GOOD keys; codes index into them
+        self.set_keys = set_keys
+        self.slot_keys = slot_keys
+        self.stat_keys = stat_keys
+        self.locations = locations
+
+        # One entry (or row) per artifact
+        self.set_codes = set_codes
+        self.slot_codes = slot_codes
+        self.main_codes = main_codes
+        self.sub_codes = sub_codes
+        self.sub_values = sub_values
+        self.sub_is_int = sub_is_int
+        self.sub_lengths = sub_lengths
+        self.levels = levels
+        self.rarities = rarities
+        self.locks = locks
+        self.location_codes = location_codes
+        self.ids = ids
+
+        # Sparse per-row exceptions: {row: {key: value}} and {row: (field, ...)}
+        self.extras = extras if extras is not None else {}
+        self.missing = missing if missing is not None else {}
+
+    @classmethod
+    def from_good(cls, items):
+        """Build from raw GOOD artifact entries (any iterable, e.g. iter_good_items())."""
+        vocabularies = ({}, {}, {'': 0}, {'': 0})
+        set_vocab, slot_vocab, stat_vocab, location_vocab = vocabularies
+
+        def code(vocab, key):
+            if key not in vocab:
+                vocab[key] = len(vocab)
+            return vocab[key]
+
+        columns = {name: [] for name in ARRAY_FIELDS}
+        extras = {}
+        missing = {}
+        empty_substats = [(0, 0.0, True)] * SUBSTAT_WIDTH
+        for row, item in enumerate(items):
+            absent = tuple(field for field in GOOD_FIELDS if field not in item)
+            substats = item.get('substats', [])
+            if len(substats) > SUBSTAT_WIDTH or not all(isinstance(substat, dict) and set(substat) == {'key', 'value'}
+                                                       and is_number(substat['value']) for substat in substats):
+                # Unusual substat lists (including non-numeric values) are kept verbatim
+                extras.setdefault(row, {})['substats'] = substats
+                substats = []
+            unusual = {key: value for key, value in item.items()
+                       if key not in GOOD_FIELDS or (key in FIELD_TYPES and type(value) is not FIELD_TYPES[key])}
+            if unusual:
+                extras.setdefault(row, {}).update(unusual)
+                item = {key: value for key, value in item.items() if key not in unusual}
+            if absent:
+                missing[row] = absent
+
+            columns['set_codes'].append(code(set_vocab, item.get('setKey', '')))
+            columns['slot_codes'].append(code(slot_vocab, item.get('slotKey', '')))
+            columns['main_codes'].append(code(stat_vocab, item.get('mainStatKey', '')))
+            entries = [(code(stat_vocab, substat['key']), substat['value'], isinstance(substat['value'], int))
+                       for substat in substats]
+            entries += empty_substats[len(entries):]
+            columns['sub_codes'].append([entry[0] for entry in entries])
+            columns['sub_values'].append([entry[1] for entry in entries])
+            columns['sub_is_int'].append([entry[2] for entry in entries])
+            columns['sub_lengths'].append(len(substats))
+            columns['levels'].append(item.get('level', 0))
+            columns['rarities'].append(item.get('rarity', 0))
+            columns['locks'].append(item.get('lock', False))
+            columns['location_codes'].append(code(location_vocab, item.get('location', '')))
+            columns['ids'].append(item.get('id', ''))
+
+        count = len(columns['ids'])
+        instruments.count("artifacts parsed", count)
+        return cls(
+            list(set_vocab), list(slot_vocab), list(stat_vocab), list(location_vocab),
+            set_codes=np.array(columns['set_codes'], dtype=code_dtype(set_vocab)),
+            slot_codes=np.array(columns['slot_codes'], dtype=code_dtype(slot_vocab)),
+            main_codes=np.array(columns['main_codes'], dtype=code_dtype(stat_vocab)),
+            sub_codes=np.array(columns['sub_codes'], dtype=code_dtype(stat_vocab)).reshape(count, SUBSTAT_WIDTH),
+            sub_values=np.array(columns['sub_values'], dtype=np.float64).reshape(count, SUBSTAT_WIDTH),
+            sub_is_int=np.array(columns['sub_is_int'], dtype=bool).reshape(count, SUBSTAT_WIDTH),
+            sub_lengths=np.array(columns['sub_lengths'], dtype=np.uint8),
+            levels=np.array(columns['levels'], dtype=np.int8),
+            rarities=np.array(columns['rarities'], dtype=np.int8),
+            locks=np.array(columns['locks'], dtype=bool),
+            location_codes=np.array(columns['location_codes'], dtype=code_dtype(location_vocab)),
+            ids=ids_array(columns['ids']),
+            extras=extras,
+            missing=missing
+        )
+
+    def __len__(self):
+        return len(self.ids)
+
+    def __getitem__(self, row):
+        return self.artifact(row)
+
+    def __iter__(self):
+        return self.iter_artifacts()
+
+    def artifact_id(self, row):
+        artifact_id = self.ids[row]
+        return artifact_id.decode('ascii') if isinstance(artifact_id, bytes) else str(artifact_id)
+
+    def good_item(self, row):
+        """Rebuild the GOOD entry of one row exactly as it was read."""
+        substats = []
+        for position in range(int(self.sub_lengths[row])):
+            value = self.sub_values[row, position]
+            substats.append({
+                'key': self.stat_keys[self.sub_codes[row, position]],
+                'value': int(value) if self.sub_is_int[row, position] else float(value)
+            })
+        item = {
+            'setKey': self.set_keys[self.set_codes[row]],
+            'rarity': int(self.rarities[row]),
+            'level': int(self.levels[row]),
+            'slotKey': self.slot_keys[self.slot_codes[row]],
+            'mainStatKey': self.stat_keys[self.main_codes[row]],
+            'substats': substats,
+            'location': self.locations[self.location_codes[row]],
+            'lock': bool(self.locks[row]),
+            'id': self.artifact_id(row)
+        }
+        for field in self.missing.get(row, ()):
+            del item[field]
+        item.update(self.extras.get(row, {}))
+        return item
+
+    def to_good(self):
+        """Return the GOOD artifact entries as a list of dicts."""
+        return [self.good_item(row) for row in range(len(self))]
+
+    def artifact(self, row):
+        """Return one row as the calculator's artifact dict (see parse_good_artifact)."""
+        return parse_good_artifact(self.good_item(row))
+
+    def scored_rows(self):
+        """Return the rows that have every required GOOD field, in order."""
+        incomplete = [row for row, fields in self.missing.items() if any(field in REQUIRED_FIELDS for field in fields)]
+        rows = np.ones(len(self), dtype=bool)
+        rows[incomplete] = False
+        return np.flatnonzero(rows)
+
+    def iter_artifacts(self, min_level=None):
+        """Yield the artifact dicts of rows at or above min_level (None keeps all).
+
+        Like good_importer.iter_good_artifacts, rows missing required GOOD
+        fields are skipped.
+        """
+        rows = self.scored_rows()
+        if min_level is not None:
+            rows = rows[np.asarray(self.levels)[rows] >= min_level]
+        for row in rows.tolist():
+            yield self.artifact(row)
+
+    def engine_features(self, engine):
+        """Build ScoringEngine.artifact_features() straight from the columns.
+
+        Vocabulary codes are translated to engine IDs once per vocabulary
+        entry, then every artifact is handled with array operations. The
+        result is identical to featurizing list(self): rows missing a
+        required GOOD field are left out.
+        """
+        scored = self.scored_rows()
+        scored_set = set(scored.tolist())
+
+        # Rows with verbatim substat lists are rare; featurize them the slow way
+        overridden = sorted(row for row, extra in self.extras.items() if 'substats' in extra and row in scored_set)
+
+        stat_ids = np.array([
+            engine.stat_index.get(STAT_KEY_MAP.get(key, key), engine.unknown_stat) for key in self.stat_keys
+        ], dtype=np.intp)
+        set_ids = np.array([engine.set_id(SET_KEY_MAP.get(key, key)) for key in self.set_keys], dtype=np.intp)
+        flat_slots = np.array([SLOT_KEY_MAP.get(key, key) in ["Flower", "Plume"] for key in self.slot_keys], dtype=bool)
+
+        count = len(self)
+        main_ids = stat_ids[self.main_codes]
+        flat_main = flat_slots[self.slot_codes]
+        artifact_set_ids = set_ids[self.set_codes]
+        relative_values = np.zeros((count, engine.unknown_stat + 1))
+        substat_counts = np.zeros((count, engine.unknown_stat + 1))
+
+        # parse_good_artifact skips entries with an empty key or a zero value
+        present = (
+            (np.arange(SUBSTAT_WIDTH) < self.sub_lengths[:, None])
+            & (self.sub_codes != 0)
+            & (self.sub_values != 0)
+        )
+        if overridden:
+            present[overridden] = False
+        rows, positions = np.nonzero(present)
+        columns = stat_ids[self.sub_codes[rows, positions]]
+        np.add.at(relative_values, (rows, columns), self.sub_values[rows, positions])
+        np.add.at(substat_counts, (rows, columns), 1)
+        relative_values /= engine.max_values
+
+        if overridden:
+            features = engine.artifact_features([self.artifact(row) for row in overridden])
+            main_ids[overridden] = features[0]
+            flat_main[overridden] = features[1]
+            artifact_set_ids[overridden] = features[2]
+            relative_values[overridden] = features[3]
+            substat_counts[overridden] = features[4]
+
+        if len(scored) < count:
+            return (main_ids[scored], flat_main[scored], artifact_set_ids[scored],
+                    relative_values[scored], substat_counts[scored])
+        return main_ids, flat_main, artifact_set_ids, relative_values, substat_counts
@@ -0,0 +1,89 @@
+import queue
+import threading
+
+
+class TaskCancelled(Exception):
+    """Raised inside a worker when its task has been cancelled."""
+
+
+class BackgroundTask:
+    """Runs work on a worker thread and hands its messages to the Tk thread.
+
+    work(task) runs on the worker thread. It reports through
+    task.progress(fraction, text) and task.emit(chunk), and should call
+    task.check_cancelled() regularly. The Tk thread drains the message
+    queue with window.after() and calls the matching handler:
+    on_progress(fraction, text), on_chunk(chunk), on_done(result),
+    on_cancelled() or on_error(exception). Handlers are the only code that
+    touches widgets.
+    """
+
+    def __init__(self, window, work, on_progress=None, on_chunk=None, on_done=None,
+                 on_cancelled=None, on_error=None, poll_interval=50, max_messages=20):
+        self.window = window
+        self.work = work
+        self.handlers = {
+            'progress': on_progress,
+            'chunk': on_chunk,
+            'done': on_done,
+            'cancelled': on_cancelled,
+            'error': on_error
+        }
+        self.poll_interval = poll_interval
+        self.max_messages = max_messages
+        self.messages = queue.Queue()
+        self.cancel_event = threading.Event()
+        self.finished = False
+        self.thread = threading.Thread(target=self._run, daemon=True)
+
+    def start(self):
+        self.thread.start()
+        self.window.after(self.poll_interval, self._poll)
+        return self
+
+    def cancel(self):
+        self.cancel_event.set()
+
+    @property
+    def cancelled(self):
+        return self.cancel_event.is_set()
+
+    # Worker-side API
+
+    def check_cancelled(self):
+        if self.cancel_event.is_set():
+            raise TaskCancelled()
+
+    def progress(self, fraction, text=""):
+        self.messages.put(('progress', fraction, text))
+
+    def emit(self, chunk):
+        self.messages.put(('chunk', chunk))
+
+    def _run(self):
+        try:
+            result = self.work(self)
+        except TaskCancelled:
+            self.messages.put(('cancelled',))
+        except Exception as e:
+            self.messages.put(('error', e))
+        else:
+            self.messages.put(('done', result))
+
+    # Tk-side polling
+
+    def _poll(self):
+        # Apply a bounded number of messages per tick so the window stays responsive
+        for _ in range(self.max_messages):
+            try:
+                kind, *payload = self.messages.get_nowait()
+            except queue.Empty:
+                break
+            if kind in ('done', 'cancelled', 'error'):
+                self.finished = True
+            handler = self.handlers[kind]
+            if handler is not None:
+                handler(*payload)
+            if self.finished:
+                return
+        self.window.after(self.poll_interval, self._poll)
@@ -0,0 +1,150 @@
+import csv
+import json
+
+from instrumentation import instruments
+from upgrade_potential import potential_rankings, remaining_upgrades
+
+# Artifacts scored per engine call; output is written after each chunk
+BATCH_CHUNK_SIZE = 500
+
+OUTPUT_FORMATS = ('jsonl', 'csv')
+
+CSV_COLUMNS = ('id', 'set', 'slot', 'main_stat', 'position', 'character', 'score', 'percentage', 'rank')
+
+# Ranks whose reach probability the potential output lists (C is always reached)
+POTENTIAL_RANKS = ('SS', 'S', 'A', 'B')
+POTENTIAL_CSV_COLUMNS = (
+    ('id', 'set', 'slot', 'main_stat', 'level', 'upgrades_left', 'position', 'character', 'expected_score')
+    + tuple(f"reach_{rank}" for rank in POTENTIAL_RANKS)
+)
+
+
+def iter_chunks(items, size):
+    """Yield lists of up to size items from any iterable."""
+    chunk = []
+    for item in items:
+        chunk.append(item)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def with_percentages(scores):
+    """Add each character's percentage of the best score to (character, score, rank) tuples."""
+    max_score = scores[0][1] if scores else 0
+    return [
+        (char, score, (score / max_score * 100) if max_score > 0 else 0, rank)
+        for char, score, rank in scores
+    ]
+
+
+def ranking_record(artifact, rankings):
+    """Return the JSON record of an artifact and its (character, score, percentage, rank) rankings."""
+    return {
+        'id': artifact.get('id', ''),
+        'set': artifact.get('set', ''),
+        'slot': artifact.get('slot', ''),
+        'main_stat': artifact.get('main_stat', ''),
+        'rankings': [
+            {'character': char, 'score': round(score, 2), 'percentage': round(percentage, 1), 'rank': rank}
+            for char, score, percentage, rank in rankings
+        ]
+    }
+
+
+def iter_scored(engine, artifacts, top=5, chunk_size=BATCH_CHUNK_SIZE):
+    """Yield (artifact, rankings) for a stream of artifacts, scoring them in chunks.
+
+    rankings holds the top (character, score, percentage, rank) tuples,
+    best first; percentage is relative to the artifact's best score, as in
+    the calculator. Only one chunk of artifacts is held at a time.
+    """
+    for chunk in iter_chunks(artifacts, chunk_size):
+        for artifact, scores in zip(chunk, engine.top_k_batch(chunk, top)):
+            yield artifact, with_percentages(scores)
+
+
+@instruments.timed("batch.write")
+def write_batch(engine, artifacts, out, output_format='jsonl', top=5, chunk_size=BATCH_CHUNK_SIZE):
+    """Score a stream of artifacts and write the top characters of each to out.
+
+    jsonl writes one object per artifact; csv writes one row per artifact
+    and character. out is flushed after every chunk so the output can be
+    consumed as it is produced. Returns the number of artifacts written.
+    """
+    if output_format not in OUTPUT_FORMATS:
+        raise ValueError(f"Unknown output format: {output_format}")
+
+    if output_format == 'csv':
+        writer = csv.writer(out)
+        writer.writerow(CSV_COLUMNS)
+
+    count = 0
+    for artifact, rankings in iter_scored(engine, artifacts, top, chunk_size):
+        if output_format == 'jsonl':
+            out.write(json.dumps(ranking_record(artifact, rankings)) + "\n")
+        else:
+            for position, (char, score, percentage, rank) in enumerate(rankings, 1):
+                writer.writerow((
+                    artifact.get('id', ''), artifact.get('set', ''), artifact.get('slot', ''),
+                    artifact.get('main_stat', ''), position, char, round(score, 2), round(percentage, 1), rank
+                ))
+        count += 1
+        if count % chunk_size == 0:
+            out.flush()
+    out.flush()
+    return count
+
+
+def potential_record(artifact, rankings):
+    """Return the JSON record of an artifact and its (character, expected score, reach) rankings."""
+    return {
+        'id': artifact.get('id', ''),
+        'set': artifact.get('set', ''),
+        'slot': artifact.get('slot', ''),
+        'main_stat': artifact.get('main_stat', ''),
+        'level': artifact.get('level', ''),
+        'upgrades_left': remaining_upgrades(artifact),
+        'rankings': [
+            {
+                'character': char,
+                'expected_score': round(expected, 2),
+                'reach': {rank: round(reach[rank], 4) for rank in POTENTIAL_RANKS}
+            }
+            for char, expected, reach in rankings
+        ]
+    }
+
+
+@instruments.timed("batch.write_potential")
+def write_potential(engine, artifacts, out, output_format='jsonl', top=5, chunk_size=BATCH_CHUNK_SIZE):
+    """Evaluate the upgrade potential of a stream of artifacts and write it to out.
+
+    Like write_batch, but characters are ranked by expected final score and
+    each comes with the probability of finishing at every rank or better.
+    Returns the number of artifacts written.
+    """
+    if output_format not in OUTPUT_FORMATS:
+        raise ValueError(f"Unknown output format: {output_format}")
+
+    if output_format == 'csv':
+        writer = csv.writer(out)
+        writer.writerow(POTENTIAL_CSV_COLUMNS)
+
+    count = 0
+    for chunk in iter_chunks(artifacts, chunk_size):
+        for artifact, rankings in zip(chunk, potential_rankings(engine, chunk, top)):
+            record = potential_record(artifact, rankings)
+            if output_format == 'jsonl':
+                out.write(json.dumps(record) + "\n")
+            else:
+                for position, ranking in enumerate(record['rankings'], 1):
+                    writer.writerow((
+                        record['id'], record['set'], record['slot'], record['main_stat'], record['level'],
+                        record['upgrades_left'], position, ranking['character'], ranking['expected_score']
+                    ) + tuple(ranking['reach'][rank] for rank in POTENTIAL_RANKS))
+            count += 1
+        out.flush()
+    return count
@@ -0,0 +1,80 @@
+from scoring_engine import MAX_SUBSTAT_VALUES
+
+# The calculator's original per-character formula, kept as plain Python so
+# optimized paths can be checked against it. The only difference from the
+# original GUI code is that sets missing from artifact_sets.json are treated
+# as non-recommended instead of raising KeyError, as the engine does.
+
+
+def reference_rank(score, artifact_set, char_data, artifact_sets, main_stat, substats):
+    char_name = char_data["Character"].strip()
+
+    # Check if artifact set is recommended
+    is_correct_set = False
+    if artifact_set in artifact_sets:
+        is_correct_set = char_name in artifact_sets[artifact_set]["recommended_for"]
+
+    # Check if main stat is preferred
+    main_stat_key = f"Main {main_stat}"
+    has_correct_main = main_stat_key in char_data and float(char_data[main_stat_key]) > 0
+
+    # Calculate substat quality
+    total_substat_score = 0
+    max_possible = 0
+    for stat, value in substats:
+        stat_key = f"Sub {stat}"
+        if stat_key in char_data:
+            weight = float(char_data[stat_key])
+            total_substat_score += value / MAX_SUBSTAT_VALUES.get(stat, 1) * weight
+            max_possible += weight
+    substat_quality = total_substat_score / max_possible if max_possible > 0 else 0
+
+    if score >= 160 and is_correct_set and has_correct_main and substat_quality >= 0.7:
+        return "SS"
+    elif score >= 120 and is_correct_set and has_correct_main:
+        return "S"
+    elif score >= 80 and (is_correct_set or has_correct_main):
+        return "A"
+    elif score >= 40:
+        return "B"
+    else:
+        return "C"
+
+
+def reference_scores(artifact, character_weights, artifact_sets):
+    """Return (character, score, rank) tuples for an artifact dict, best first."""
+    artifact_set = artifact.get('set', '')
+    artifact_type = artifact.get('slot', '')
+    main_stat = artifact.get('main_stat', '')
+    substats = [(substat['stat'], float(substat['value'])) for substat in artifact.get('substats', [])]
+
+    scores = []
+    for char_data in character_weights:
+        char_name = char_data["Character"].strip()
+
+        # For Flower (HP) and Plume (ATK), main stat score is always 1
+        if artifact_type in ["Flower", "Plume"]:
+            main_stat_score = 100
+        else:
+            main_stat_score = float(char_data.get(f"Main {main_stat}", 0)) * 100
+
+        substat_score = 0
+        for stat, value in substats:
+            stat_key = f"Sub {stat}"
+            if stat_key in char_data:
+                substat_score += value / MAX_SUBSTAT_VALUES.get(stat, 1) * float(char_data[stat_key]) * 100
+
+        set_multiplier = 0.2
+        if artifact_set:
+            set_data = artifact_sets.get(artifact_set)
+            if set_data is not None and char_name in set_data["recommended_for"]:
+                set_multiplier = set_data["priority"].get(char_name, 0.8)
+            elif not any(char_name in other_set["recommended_for"] for other_set in artifact_sets.values()):
+                set_multiplier = 0.8
+
+        final_score = (main_stat_score + substat_score) * set_multiplier
+        rank = reference_rank(final_score, artifact_set, char_data, artifact_sets, main_stat, substats)
+        scores.append((char_name, final_score, rank))
+
+    scores.sort(key=lambda x: x[1], reverse=True)
+    return scores
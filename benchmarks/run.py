@@ -0,0 +1,272 @@
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+
+from artifact_columns import ArtifactColumns
+from benchmarks.reference import reference_scores
+from benchmarks.synthetic import write_good
+from columnar_cache import ColumnarCache
+from good_importer import iter_good_artifacts, iter_good_items
+from scoring_engine import ScoringEngine
+from upgrade_potential import upgrade_potential
+
+BASELINE_PATH = os.path.join(os.path.dirname(__file__), 'baseline.json')
+
+# Slower than baseline x (1 + threshold) fails, unless the difference is below the noise floor
+DEFAULT_THRESHOLD = 0.25
+NOISE_FLOOR = 0.005
+
+# Cases that hold every artifact as a dict only run up to this size
+DICT_CASE_LIMIT = 200_000
+
+# Artifacts timed one call at a time in the single-scoring cases
+SINGLE_SAMPLE = 1000
+
+# Artifacts checked against the (slow) reference formula per dataset
+REFERENCE_SAMPLE = 2000
+
+SCORE_TOLERANCE = 1e-9
+
+
+def best_time(func, repeat):
+    """Return the best wall time of repeat runs of func()."""
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def compare_rankings(expected, actual):
+    """Return a description of the first difference between two rankings, or None.
+
+    Scores must agree within SCORE_TOLERANCE and ranks exactly. The order
+    is compared by score, since characters whose scores tie up to float
+    rounding may come out in either order.
+    """
+    if len(expected) != len(actual):
+        return f"{len(actual)} characters instead of {len(expected)}"
+    actual_by_char = {char: (score, rank) for char, score, rank in actual}
+    for char, score, rank in expected:
+        if char not in actual_by_char:
+            return f"{char} missing"
+        actual_score, actual_rank = actual_by_char[char]
+        if abs(actual_score - score) > SCORE_TOLERANCE * max(1.0, abs(score)):
+            return f"{char}: score {actual_score} instead of {score}"
+        if actual_rank != rank:
+            return f"{char}: rank {actual_rank} instead of {rank}"
+    for (_, expected_score, _), (_, actual_score, _) in zip(expected, actual):
+        if abs(actual_score - expected_score) > SCORE_TOLERANCE * max(1.0, abs(expected_score)):
+            return "characters out of order"
+    return None
+
+
+def compare_head(ranking, actual):
+    """Return a description of how actual fails to be the head of a full ranking, or None.
+
+    Every character in actual must carry its score and rank from ranking,
+    and the scores must be the len(actual) best within SCORE_TOLERANCE.
+    """
+    head = ranking[:len(actual)]
+    if len(head) != len(actual):
+        return f"{len(actual)} characters instead of {len(head)}"
+    ranking_by_char = {char: (score, rank) for char, score, rank in ranking}
+    for (char, score, rank), (_, head_score, _) in zip(actual, head):
+        if char not in ranking_by_char:
+            return f"{char} is not a character"
+        expected_score, expected_rank = ranking_by_char[char]
+        if abs(score - expected_score) > SCORE_TOLERANCE * max(1.0, abs(expected_score)):
+            return f"{char}: score {score} instead of {expected_score}"
+        if rank != expected_rank:
+            return f"{char}: rank {rank} instead of {expected_rank}"
+        if abs(score - head_score) > SCORE_TOLERANCE * max(1.0, abs(head_score)):
+            return f"{char} ({score}) is not among the best (expected {head_score})"
+    return None
+
+
+def check_correctness(engine, artifacts, columns):
+    """Compare every optimized scoring path with the reference formula.
+
+    Returns a list of failure descriptions.
+    """
+    sample = artifacts[:REFERENCE_SAMPLE]
+    expected = [reference_scores(artifact, engine.character_weights, engine.artifact_sets) for artifact in sample]
+
+    rows = {
+        'score_artifacts': engine.score_artifacts(sample),
+        'score_artifact': [engine.score_artifact(artifact) for artifact in sample],
+        'columns': engine.rankings_from_matrix(*engine.rank_matrix(columns))[:len(sample)]
+    }
+    failures = []
+    for name, rankings in rows.items():
+        for i, (want, got) in enumerate(zip(expected, rankings)):
+            problem = compare_rankings(want, got)
+            if problem:
+                failures.append(f"{name}, artifact {i}: {problem}")
+                break
+
+    # Top-K paths must return the head of the full ranking
+    for name, rankings in (('top_k', [engine.top_k(artifact, 5) for artifact in sample]),
+                           ('top_k_batch', engine.top_k_batch(sample, 5))):
+        for i, (want, got) in enumerate(zip(expected, rankings)):
+            problem = compare_rankings(want[:5], got)
+            if problem:
+                failures.append(f"{name}, artifact {i}: {problem}")
+                break
+
+    # The pruned top_k scan must return the head of the unpruned ranking for
+    # any k; which of two characters tied at the cut comes back is arbitrary
+    for k in (1, 3, 10):
+        for i, (ranking, artifact) in enumerate(zip(rows['score_artifacts'], sample)):
+            problem = compare_head(ranking, engine.top_k(artifact, k))
+            if problem:
+                failures.append(f"top_k pruning, k={k}, artifact {i}: {problem}")
+                break
+    return failures
+
+
+def render_case(artifacts):
+    """Return a function timing the card grid, or None when there is no display."""
+    try:
+        import tkinter as tk
+        from card_grid import VirtualCardGrid
+        root = tk.Tk()
+    except Exception:
+        return None
+    root.geometry("800x600")
+    grid = VirtualCardGrid(root, lambda artifact: None)
+    grid.grid(row=0, column=0)
+    root.update()
+
+    def render():
+        grid.set_items(artifacts)
+        root.update_idletasks()
+        # Scroll through the inventory a screen at a time
+        for step in range(1, 21):
+            grid.yview('moveto', step / 20)
+            root.update_idletasks()
+
+    return render
+
+
+def dataset_cases(engine, path, artifacts, cache_dir):
+    """Return [(case, function)] for one dataset file.
+
+    artifacts is the parsed inventory, or None for datasets too large to
+    hold as dicts; those only run the streaming and columnar cases.
+    """
+    cases = [
+        ('parse_stream', lambda: sum(1 for _ in iter_good_artifacts(path, min_level=None))),
+        ('parse_columns', lambda: ArtifactColumns.from_good(iter_good_items(path))),
+    ]
+    cache = ColumnarCache(cache_dir)
+    columns = cache.load_inventory(path)
+    cases += [
+        ('load_columns_cached', lambda: cache.load_inventory(path)),
+        ('batch_score_columns', lambda: engine.score_matrix(columns)),
+        ('rank_columns', lambda: engine.rank_matrix(columns)),
+    ]
+    if artifacts is not None:
+        single = artifacts[:SINGLE_SAMPLE]
+        cases += [
+            ('single_score_x1000', lambda: [engine.score_artifact(artifact) for artifact in single]),
+            ('single_top_k_x1000', lambda: [engine.top_k(artifact, 5) for artifact in single]),
+            ('upgrade_potential_x1000', lambda: upgrade_potential(engine, single)),
+            ('batch_score', lambda: engine.score_matrix(artifacts)),
+            ('rank_full', lambda: engine.score_artifacts(artifacts)),
+            ('rank_top_k_batch', lambda: engine.top_k_batch(artifacts, 5)),
+        ]
+        render = render_case(artifacts)
+        if render is not None:
+            cases.append(('render_cards', render))
+    return cases
+
+
+def run(args):
+    if args.data_dir:
+        os.makedirs(args.data_dir, exist_ok=True)
+        return run_in(args, args.data_dir)
+    # Synthetic exports and their cache take hundreds of MB; only --data-dir keeps them
+    with tempfile.TemporaryDirectory(prefix='artifact-bench-') as data_dir:
+        return run_in(args, data_dir)
+
+
+def run_in(args, data_dir):
+    """Run every case with synthetic exports and caches kept under data_dir."""
+    engine = ScoringEngine.from_files(args.weights, args.sets)
+
+    datasets = [('bundled', args.artifacts)]
+    for size in args.sizes:
+        path = os.path.join(data_dir, f"synthetic-{size}-seed{args.seed}.json")
+        if not os.path.exists(path):
+            print(f"generating {size} synthetic artifacts...", file=sys.stderr)
+            write_good(path, size, args.seed)
+        datasets.append((f"synthetic-{size}", path))
+
+    baseline = {}
+    if not args.save_baseline and os.path.exists(args.baseline):
+        with open(args.baseline, 'r') as f:
+            baseline = json.load(f)
+
+    results = {}
+    failures = []
+    print(f"{'case':40} {'artifacts':>10} {'seconds':>10} {'baseline':>10}")
+    for name, path in datasets:
+        count = sum(1 for _ in iter_good_items(path))
+        cache_dir = os.path.join(data_dir, 'columnar-cache')
+
+        artifacts = None
+        if count <= DICT_CASE_LIMIT:
+            artifacts = list(iter_good_artifacts(path, min_level=None))
+            columns = ArtifactColumns.from_good(iter_good_items(path))
+            for problem in check_correctness(engine, artifacts, columns):
+                failures.append(f"{name}: result differs from the reference formula: {problem}")
+
+        for case, func in dataset_cases(engine, path, artifacts, cache_dir):
+            key = f"{name}/{case}"
+            seconds = best_time(func, args.repeat)
+            results[key] = seconds
+            previous = baseline.get(key)
+            shown = f"{previous:10.4f}" if previous is not None else ''
+            print(f"{key:40} {count:10d} {seconds:10.4f} {shown:>10}")
+            if previous is not None and seconds > previous * (1 + args.threshold) and seconds - previous > NOISE_FLOOR:
+                failures.append(f"{key}: {seconds:.4f}s is more than {args.threshold:.0%} slower than {previous:.4f}s")
+
+    if args.save_baseline:
+        with open(args.baseline, 'w') as f:
+            json.dump(results, f, indent=2, sort_keys=True)
+        print(f"baseline saved to {args.baseline}")
+
+    for failure in failures:
+        print(f"FAIL {failure}")
+    return 1 if failures else 0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog='python -m benchmarks.run',
+        description="Time parsing, scoring, ranking and card rendering, and check results against the reference formula."
+    )
+    parser.add_argument('--sizes', type=lambda text: [int(size) for size in text.split(',') if size],
+                        default=[10_000, 100_000],
+                        help="synthetic inventory sizes, comma separated (default 10000,100000; add 1000000 for the full run)")
+    parser.add_argument('--seed', type=int, default=0, help="synthetic generator seed")
+    parser.add_argument('--repeat', type=int, default=5, help="runs per case; the best time counts")
+    parser.add_argument('--artifacts', default='artifacts.json', help="bundled GOOD export")
+    parser.add_argument('--data-dir', help="where synthetic exports are kept between runs (default: a temporary directory removed after the run)")
+    parser.add_argument('--baseline', default=BASELINE_PATH, help="baseline timings JSON")
+    parser.add_argument('--save-baseline', action='store_true', help="record these timings as the new baseline")
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD,
+                        help="allowed slowdown against the baseline (default 0.25 = 25%%)")
+    parser.add_argument('--weights', default='character_weights.json', help="character weights JSON")
+    parser.add_argument('--sets', default='artifact_sets.json', help="artifact sets JSON")
+    return run(parser.parse_args(argv))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
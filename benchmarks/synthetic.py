@@ -0,0 +1,85 @@
+import json
+import random
+
+from scoring_engine import SET_KEY_MAP, SUBSTAT_ODDS, SUBSTAT_ROLLS
+
+# Main stat odds per slot, roughly as the game drops them
+MAIN_STATS = {
+    'flower': {'hp': 1},
+    'plume': {'atk': 1},
+    'sands': {'hp_': 26.68, 'atk_': 26.66, 'def_': 26.66, 'enerRech_': 10, 'eleMas': 10},
+    'goblet': {
+        'hp_': 19.25, 'atk_': 19.25, 'def_': 19, 'eleMas': 2.5, 'physical_dmg_': 5,
+        'pyro_dmg_': 5, 'hydro_dmg_': 5, 'cryo_dmg_': 5, 'electro_dmg_': 5,
+        'anemo_dmg_': 5, 'geo_dmg_': 5, 'dendro_dmg_': 5
+    },
+    'circlet': {'hp_': 22, 'atk_': 22, 'def_': 22, 'critRate_': 10, 'critDMG_': 10, 'heal_': 10, 'eleMas': 4}
+}
+
+FLAT_STATS = {'hp', 'atk', 'def', 'eleMas'}
+
+
+def good_value(key, value):
+    """Round a substat total the way GOOD exports show it."""
+    if key in FLAT_STATS:
+        return int(round(value))
+    value = round(value, 1)
+    return int(value) if value == int(value) else value
+
+
+def pick(rng, weights, exclude=()):
+    keys = [key for key in weights if key not in exclude]
+    return rng.choices(keys, weights=[weights[key] for key in keys])[0]
+
+
+def generate_artifact(rng, index):
+    """Return one realistic 5-star GOOD artifact entry."""
+    slot = rng.choice(list(MAIN_STATS))
+    main = pick(rng, MAIN_STATS[slot])
+    level = rng.choice((0, 0, 0, 4, 8, 12, 16, 20, 20, 20))
+
+    # Three or four starting substats, then one roll per four levels;
+    # on three-line pieces the first roll adds the fourth substat instead
+    totals = {}
+    for _ in range(4 if rng.random() < 0.2 else 3):
+        key = pick(rng, SUBSTAT_ODDS, exclude=set(totals) | {main})
+        totals[key] = rng.choice(SUBSTAT_ROLLS[key])
+    for _ in range(level // 4):
+        if len(totals) < 4:
+            key = pick(rng, SUBSTAT_ODDS, exclude=set(totals) | {main})
+            totals[key] = rng.choice(SUBSTAT_ROLLS[key])
+        else:
+            key = rng.choice(list(totals))
+            totals[key] += rng.choice(SUBSTAT_ROLLS[key])
+
+    substats = [{'key': key, 'value': good_value(key, value)} for key, value in totals.items()]
+    substats += [{'key': '', 'value': 0}] * (4 - len(substats))
+    return {
+        'setKey': rng.choice(list(SET_KEY_MAP)),
+        'rarity': 5,
+        'level': level,
+        'slotKey': slot,
+        'mainStatKey': main,
+        'substats': substats,
+        'location': '' if rng.random() < 0.85 else 'Traveler',
+        'lock': rng.random() < 0.5,
+        'id': f"artifact_{index}"
+    }
+
+
+def generate_good(count, seed=0):
+    """Yield count artifact entries; the same seed always yields the same inventory."""
+    rng = random.Random(seed)
+    for index in range(count):
+        yield generate_artifact(rng, index)
+
+
+def write_good(path, count, seed=0):
+    """Write a GOOD export of count synthetic artifacts, one entry at a time."""
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write('{"format": "GOOD", "version": 2, "source": "synthetic", "artifacts": [')
+        for index, item in enumerate(generate_good(count, seed)):
+            if index:
+                f.write(', ')
+            f.write(json.dumps(item))
+        f.write(']}')
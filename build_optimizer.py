@@ -0,0 +1,238 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from scoring_engine import RANKS
+
+SLOTS = ("Flower", "Plume", "Sands", "Goblet", "Circlet")
+SET_MODES = ("4pc", "2+2", "either")
+
+# Label of candidates whose set is not recommended for the character
+OFF_SET = -1
+
+# Inventory x characters cells below which optimize_roster stays in-process;
+# process start-up and shipping the features cost more than they save there
+PARALLEL_MIN_CELLS = 1_000_000
+
+# Per-process optimizer, installed once by the pool initializer
+_worker_optimizer = None
+
+
+def requirement_met(set_counts, set_mode):
+    """Check whether recommended-set piece counts satisfy a set mode."""
+    four_piece = any(count >= 4 for count in set_counts.values())
+    two_two = sum(1 for count in set_counts.values() if count >= 2) >= 2
+    if set_mode == "4pc":
+        return four_piece
+    if set_mode == "2+2":
+        return two_two
+    return four_piece or two_two
+
+
+def requirement_reachable(set_counts, recommended, remaining, set_mode):
+    """Check whether filling the remaining slots can still satisfy a set mode."""
+    deficits = sorted(max(0, 2 - set_counts.get(set_id, 0)) for set_id in recommended)
+    four_piece = any(set_counts.get(set_id, 0) + remaining >= 4 for set_id in recommended)
+    two_two = len(deficits) >= 2 and deficits[0] + deficits[1] <= remaining
+    if set_mode == "4pc":
+        return four_piece
+    if set_mode == "2+2":
+        return two_two
+    return four_piece or two_two
+
+
+class BuildOptimizer:
+    """Finds the best five-piece build for a character from an inventory.
+
+    The inventory is featurized once and scored against every character
+    (lazily, on the first search); each search then picks one artifact per
+    slot maximizing total score, subject to a 4-piece or 2+2 requirement
+    over the character's recommended sets in artifact_sets.json.
+    """
+
+    def __init__(self, engine, artifacts):
+        self.engine = engine
+        self.artifacts = artifacts
+        self.features = engine.artifact_features(artifacts)
+        self.set_ids = self.features[2]
+        slots = [artifact.get('slot', '') for artifact in artifacts]
+        self.slot_rows = {slot: np.array([row for row, name in enumerate(slots) if name == slot], dtype=np.intp)
+                          for slot in SLOTS}
+        self.scores = None
+        self.ranks = None
+
+    def __getstate__(self):
+        # Workers get the compact features and score them themselves; the
+        # artifact dicts and score tables stay in the parent
+        state = dict(self.__dict__)
+        state['artifacts'] = None
+        state['scores'] = state['ranks'] = None
+        return state
+
+    def slot_candidates(self, col, recommended):
+        """Return the non-dominated (score, set label, row) candidates of each slot.
+
+        Within a slot, pieces sharing a set label are interchangeable for the
+        set requirement, so only the best piece of each recommended set and
+        the best off-set piece can appear in an optimal build.
+        """
+        recommended_ids = np.array(sorted(recommended), dtype=np.intp)
+        candidates = {}
+        for slot, rows in self.slot_rows.items():
+            if not len(rows):
+                candidates[slot] = []
+                continue
+            scores = self.scores[rows, col]
+            labels = np.where(np.isin(self.set_ids[rows], recommended_ids), self.set_ids[rows], OFF_SET)
+            order = np.argsort(-scores, kind='stable')
+            _, first = np.unique(labels[order], return_index=True)
+            best = sorted(order[first].tolist(), key=lambda i: -scores[i])
+            candidates[slot] = [(float(scores[i]), int(labels[i]), int(rows[i])) for i in best]
+        return candidates
+
+    def optimize(self, character, set_mode="either"):
+        """Return the best build for a character, or None if no build is possible.
+
+        set_mode is "4pc", "2+2" or "either". Characters without recommended
+        sets get the best unconstrained build. The result is a dict with the
+        character, total score, set bonus description and
+        {slot: (artifact, score, rank)} pieces.
+        """
+        if set_mode not in SET_MODES:
+            raise ValueError(f"Unknown set mode: {set_mode}")
+        if character not in self.engine.character_index:
+            raise ValueError(f"Unknown character: {character}")
+        result = self.search(character, set_mode)
+        if result is None:
+            return None
+        best_score, pieces = result
+        return self.build(character, best_score, pieces)
+
+    def search(self, character, set_mode="either"):
+        """Return (total score, [(slot, row, score, rank code), ...]) of the best build, or None."""
+        if self.scores is None:
+            self.scores, self.ranks = self.engine.rank_features(self.features)
+        col = self.engine.character_index[character]
+
+        recommended = {self.engine.set_ids[set_name] for set_name in self.engine.set_priorities.get(character, {})}
+        candidates = self.slot_candidates(col, recommended)
+        if any(not slot_candidates for slot_candidates in candidates.values()):
+            return None
+
+        # Search the slots with the fewest candidates first
+        slots = sorted(SLOTS, key=lambda slot: len(candidates[slot]))
+        # Upper bound of what the remaining slots can add
+        suffix_best = [0.0] * (len(slots) + 1)
+        for k in range(len(slots) - 1, -1, -1):
+            suffix_best[k] = suffix_best[k + 1] + candidates[slots[k]][0][0]
+
+        best_score = -1.0
+        best_rows = None
+        chosen = []
+        set_counts = {}
+
+        def search(k, score):
+            nonlocal best_score, best_rows
+            if k == len(slots):
+                if not recommended or requirement_met(set_counts, set_mode):
+                    best_score = score
+                    best_rows = list(chosen)
+                return
+            if recommended and not requirement_reachable(set_counts, recommended, len(slots) - k, set_mode):
+                return
+            for piece_score, label, row in candidates[slots[k]]:
+                # Candidates are sorted, so once the bound fails it fails for the rest
+                if score + piece_score + suffix_best[k + 1] <= best_score:
+                    break
+                chosen.append(row)
+                if label != OFF_SET:
+                    set_counts[label] = set_counts.get(label, 0) + 1
+                search(k + 1, score + piece_score)
+                if label != OFF_SET:
+                    set_counts[label] -= 1
+                chosen.pop()
+
+        search(0, 0.0)
+        if best_rows is None:
+            return None
+        return best_score, [(slot, row, float(self.scores[row, col]), int(self.ranks[row, col]))
+                            for slot, row in zip(slots, best_rows)]
+
+    def build(self, character, best_score, pieces):
+        """Turn a search() result into the build dict returned by optimize()."""
+        recommended = set(self.engine.set_priorities.get(character, {}))
+        counts = {}
+        build_pieces = {}
+        for slot, row, score, rank in pieces:
+            artifact = self.artifacts[row]
+            build_pieces[slot] = (artifact, score, RANKS[rank])
+            if artifact.get('set', '') in recommended:
+                counts[artifact['set']] = counts.get(artifact['set'], 0) + 1
+        four_piece = [name for name, count in counts.items() if count >= 4]
+        two_piece = [name for name, count in counts.items() if count >= 2]
+        if four_piece:
+            set_bonus = f"4pc {four_piece[0]}"
+        elif len(two_piece) >= 2:
+            set_bonus = f"2+2 {two_piece[0]} / {two_piece[1]}"
+        else:
+            set_bonus = ""
+
+        return {
+            'character': character,
+            'score': best_score,
+            'set_bonus': set_bonus,
+            'pieces': {slot: build_pieces[slot] for slot in SLOTS}
+        }
+
+
+def _init_worker(optimizer):
+    global _worker_optimizer
+    _worker_optimizer = optimizer
+
+
+def _optimize_chunk(task):
+    characters, set_mode = task
+    return [_worker_optimizer.search(character, set_mode) for character in characters]
+
+
+def optimize_roster(engine, artifacts, characters=None, set_mode="either", processes=None):
+    """Optimize builds for a whole roster, spreading characters over a process pool.
+
+    The parent featurizes the inventory once; the optimizer (features, set
+    and slot indexes, no artifact dicts) is sent to each worker once through
+    the pool initializer. Each worker scores the features itself on its
+    first task, so the parent does no scoring; tasks carry chunks of
+    character names. Returns {character: build or None} in
+    roster order regardless of completion order.
+
+    Inventories below PARALLEL_MIN_CELLS artifact x character cells, or
+    processes=1, run in-process, where the pool's start-up cost would
+    outweigh the search.
+    """
+    if characters is None:
+        characters = engine.characters
+    characters = list(characters)
+    if set_mode not in SET_MODES:
+        raise ValueError(f"Unknown set mode: {set_mode}")
+    for character in characters:
+        if character not in engine.character_index:
+            raise ValueError(f"Unknown character: {character}")
+
+    if processes is None:
+        processes = os.cpu_count() or 1
+    processes = min(processes, len(characters))
+    if processes <= 1 or len(artifacts) * len(characters) < PARALLEL_MIN_CELLS:
+        optimizer = BuildOptimizer(engine, artifacts)
+        return {character: optimizer.optimize(character, set_mode) for character in characters}
+
+    optimizer = BuildOptimizer(engine, artifacts)
+    # A few chunks per worker balances load without per-task overhead
+    chunk_size = max(1, len(characters) // (processes * 4))
+    tasks = [(characters[start:start + chunk_size], set_mode) for start in range(0, len(characters), chunk_size)]
+    with ProcessPoolExecutor(max_workers=processes, initializer=_init_worker, initargs=(optimizer,)) as pool:
+        results = [result for chunk in pool.map(_optimize_chunk, tasks) for result in chunk]
+    return {
+        character: optimizer.build(character, *result) if result is not None else None
+        for character, result in zip(characters, results)
+    }
@@ -0,0 +1,735 @@
+import json
+import os
+import tkinter as tk
+from tkinter import ttk, messagebox, filedialog
+from background_tasks import BackgroundTask
+from card_grid import VirtualCardGrid
+from columnar_cache import ColumnarCache
+from fodder import iter_fodder
+from inventory_assignment import assign_inventory
+from instrumentation import instruments, configure_from_env
+from inventory_diff import diff_inventories, apply_diff, summarize_diff
+from score_cache import ScoreCache
+from set_store import SetStore, file_stamp
+from upgrade_potential import potential_rankings, remaining_upgrades
+from scoring_engine import (
+    STAT_KEY_MAP, SET_KEY_MAP, SLOT_KEY_MAP, MAX_SUBSTAT_VALUES
+)
+
+# Number of artifacts parsed and scored per chunk handed to the window
+IMPORT_CHUNK_SIZE = 200
+
+# How often the weight and set files are checked for edits, in milliseconds
+RELOAD_POLL_MS = 500
+
+WEIGHTS_PATH = 'character_weights.json'
+SETS_PATH = 'artifact_sets.json'
+
+class ModernCombobox(ttk.Combobox):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.configure(
+            width=20,
+            font=('Segoe UI', 10),
+            state='readonly'
+        )
+
+class ModernEntry(ttk.Entry):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.configure(
+            width=10,
+            font=('Segoe UI', 10)
+        )
+
+class ArtifactScoreCalculator:
+    @instruments.timed("gui.startup")
+    def __init__(self):
+        # Binary cache of parsed inventories and compiled weights
+        self.columnar_cache = ColumnarCache()
+
+        # Set data and its edit journal, followed while the window is open
+        self.set_store = SetStore(SETS_PATH)
+        self.weights_stamp = file_stamp(WEIGHTS_PATH)
+
+        # Headless scoring engine shared with batch jobs, built from character
+        # weights and artifact sets
+        with instruments.timer("gui.load_engine"):
+            self.engine = self.columnar_cache.load_engine(WEIGHTS_PATH, SETS_PATH, self.set_store.load())
+        self.character_weights = self.engine.character_weights
+        self.artifact_sets = self.engine.artifact_sets
+
+        # Rankings persisted across sessions, keyed by artifact content
+        self.score_cache = ScoreCache()
+
+        # Define GOOD key mappings
+        self.stat_key_map = STAT_KEY_MAP
+        self.set_key_map = SET_KEY_MAP
+        self.slot_key_map = SLOT_KEY_MAP
+
+        # Store parsed artifacts
+        self.artifacts = []
+        self.import_task = None
+        self.inventory_path = None
+        self.import_min_level = 20
+
+        # (set names it depends on or None for all, callable redrawing it) of the result shown
+        self.result_view = None
+
+        # Define theoretical best values for substats
+        self.max_substat_values = MAX_SUBSTAT_VALUES
+
+        # Setup window
+        self.window = tk.Tk()
+        self.window.title("Genshin Impact Artifact Calculator")
+        self.window.geometry("800x600")
+        self.window.configure(bg='#f0f0f0')
+
+        # Create custom styles for cards
+        style = ttk.Style()
+        style.configure('Card.TFrame', relief='solid', borderwidth=1)
+        style.configure('CardHover.TFrame', relief='solid', borderwidth=1, background='#e0e0e0')
+
+        # Create main frame
+        main_frame = ttk.Frame(self.window, padding="5")
+        main_frame.grid(row=0, column=0, sticky=(tk.W, tk.E, tk.N, tk.S))
+
+        # Create notebook for tabs
+        self.notebook = ttk.Notebook(main_frame)
+        self.notebook.grid(row=0, column=0, sticky=(tk.W, tk.E, tk.N, tk.S))
+
+        # Calculator tab
+        calculator_frame = ttk.Frame(self.notebook, padding="5")
+        self.notebook.add(calculator_frame, text="Calculator")
+
+        # Artifacts tab
+        artifacts_frame = ttk.Frame(self.notebook, padding="5")
+        self.notebook.add(artifacts_frame, text="My Artifacts")
+
+        # Left panel for inputs in calculator tab
+        left_panel = ttk.Frame(calculator_frame)
+        left_panel.grid(row=0, column=0, padx=(0, 5), sticky=(tk.N, tk.W))
+
+        # Create input fields (artifact set, type, main stat, substats)
+        self.create_input_fields(left_panel)
+
+        # Right panel for results in calculator tab
+        right_panel = ttk.LabelFrame(calculator_frame, text="Character Rankings", padding="5")
+        right_panel.grid(row=0, column=1, sticky=(tk.N, tk.S, tk.E, tk.W))
+
+        # Create scrollable results area
+        results_frame = ttk.Frame(right_panel)
+        results_frame.grid(row=0, column=0, sticky=(tk.N, tk.S, tk.E, tk.W))
+
+        # Add scrollbar to results
+        scrollbar = ttk.Scrollbar(results_frame)
+        scrollbar.grid(row=0, column=1, sticky=(tk.N, tk.S))
+
+        self.result_text = tk.Text(
+            results_frame,
+            width=40,
+            height=30,
+            yscrollcommand=scrollbar.set,
+            font=('Segoe UI', 10)
+        )
+        self.result_text.grid(row=0, column=0, sticky=(tk.N, tk.S, tk.E, tk.W))
+        scrollbar.config(command=self.result_text.yview)
+
+        # Create artifacts display in artifacts tab
+        self.create_artifacts_display(artifacts_frame)
+
+        # Configure grid weights
+        main_frame.columnconfigure(0, weight=1)
+        main_frame.rowconfigure(0, weight=1)
+        calculator_frame.columnconfigure(1, weight=1)
+        right_panel.columnconfigure(0, weight=1)
+        right_panel.rowconfigure(0, weight=1)
+        results_frame.columnconfigure(0, weight=1)
+        results_frame.rowconfigure(0, weight=1)
+
+        # Reopen the last inventory; unchanged files load straight from the columnar cache
+        last_inventory = self.columnar_cache.last_inventory()
+        if last_inventory:
+            self.window.after_idle(lambda: self.load_artifacts_file(last_inventory, announce=False))
+
+        # Follow weight and set edits, e.g. from the set configurator
+        self.window.after(RELOAD_POLL_MS, self.poll_data_files)
+
+    def create_input_fields(self, parent):
+        # Artifact Set selection
+        ttk.Label(parent, text="Artifact Set:").grid(row=0, column=0, sticky=tk.W, pady=3)
+        self.artifact_set = ttk.Combobox(parent, values=sorted(self.artifact_sets.keys()), width=25)
+        self.artifact_set.grid(row=0, column=1, columnspan=2, sticky=tk.W, pady=3)
+
+        # Artifact Type selection
+        ttk.Label(parent, text="Artifact Type:").grid(row=1, column=0, sticky=tk.W, pady=3)
+        self.artifact_type = ttk.Combobox(parent, values=["Flower", "Plume", "Sands", "Goblet", "Circlet"], width=25)
+        self.artifact_type.grid(row=1, column=1, columnspan=2, sticky=tk.W, pady=3)
+
+        # Main Stat selection
+        ttk.Label(parent, text="Main Stat:").grid(row=2, column=0, sticky=tk.W, pady=3)
+        self.main_stat = ttk.Combobox(parent, values=self.get_main_stats(), width=25)
+        self.main_stat.grid(row=2, column=1, columnspan=2, sticky=tk.W, pady=3)
+
+        # Bind the event to update main stat options
+        self.artifact_type.bind('<<ComboboxSelected>>', self.update_main_stat_options)
+
+        # Substats frame
+        substat_frame = ttk.LabelFrame(parent, text="Substats", padding="5")
+        substat_frame.grid(row=3, column=0, columnspan=3, sticky=(tk.W, tk.E), pady=5)
+
+        self.substat_vars = []
+        self.substat_value_vars = []
+        for i in range(4):
+            ttk.Label(substat_frame, text=f"Substat {i+1}:").grid(row=i, column=0, sticky=tk.W, pady=2)
+            stat_combo = ttk.Combobox(substat_frame, values=self.get_sub_stats(), width=15)
+            stat_combo.grid(row=i, column=1, padx=3, pady=2)
+            value_entry = ttk.Entry(substat_frame, width=8)
+            value_entry.grid(row=i, column=2, padx=3, pady=2)
+            self.substat_vars.append(stat_combo)
+            self.substat_value_vars.append(value_entry)
+
+        # Buttons
+        button_frame = ttk.Frame(parent)
+        button_frame.grid(row=4, column=0, columnspan=3, pady=5)
+        
+        ttk.Button(button_frame, text="Calculate", command=self.calculate_scores).grid(row=0, column=0, padx=3)
+        ttk.Button(button_frame, text="Load Test Data", command=self.load_test_data).grid(row=0, column=1, padx=3)
+        ttk.Button(button_frame, text="Parse Artifacts", command=self.parse_artifacts).grid(row=0, column=2, padx=3)
+
+    def get_main_stats(self):
+        if self.artifact_type.get() == "Flower":
+            return ["HP"]
+        elif self.artifact_type.get() == "Plume":
+            return ["ATK"]
+        elif self.artifact_type.get() == "Sands":
+            return ["HP%", "ATK%", "DEF%", "EM", "ER"]
+        elif self.artifact_type.get() == "Goblet":
+            return ["HP%", "ATK%", "DEF%", "EM", 
+                   "Physical DMG Bonus", "Pyro DMG Bonus", "Hydro DMG Bonus", 
+                   "Cryo DMG Bonus", "Electro DMG Bonus", "Anemo DMG Bonus", 
+                   "Geo DMG Bonus", "Dendro DMG Bonus"]
+        else:  # Circlet
+            return ["HP%", "ATK%", "DEF%", "EM", "CRIT Rate", "CRIT DMG", "Healing Bonus"]
+
+    def get_sub_stats(self):
+        return [
+            "Flat HP", "Flat ATK", "Flat DEF",
+            "HP%", "ATK%", "DEF%",
+            "EM", "ER",
+            "CRIT Rate", "CRIT DMG"
+        ]
+
+    def update_main_stat_options(self, event=None):
+        self.main_stat['values'] = self.get_main_stats()
+        self.main_stat.set('')
+
+    @instruments.timed("gui.calculate_scores")
+    def calculate_scores(self):
+        try:
+            # Get artifact details
+            artifact_set = self.artifact_set.get()
+            artifact_type = self.artifact_type.get()
+            main_stat = self.main_stat.get()
+            
+            # Get substats
+            substats = []
+            for i in range(4):
+                stat = self.substat_vars[i].get()
+                if stat:
+                    try:
+                        value = float(self.substat_value_vars[i].get())
+                        substats.append((stat, value))
+                    except ValueError:
+                        continue
+
+            artifact = {
+                'set': artifact_set,
+                'slot': artifact_type,
+                'main_stat': main_stat,
+                'substats': [{'stat': stat, 'value': value} for stat, value in substats]
+            }
+            scores = self.score_cache.rankings(self.engine, [artifact])[0]
+
+            # Display sorted scores
+            self.display_results(scores, f"Set: {artifact_set}\nType: {artifact_type}\nMain: {main_stat}")
+            self.result_view = ({artifact_set}, self.calculate_scores)
+
+        except Exception as e:
+            messagebox.showerror("Error", str(e))
+
+    @instruments.timed("gui.display_results")
+    def display_results(self, scores, artifact_info=""):
+        """Display character rankings with formatting."""
+        self.result_text.delete(1.0, tk.END)
+        
+        if artifact_info:
+            self.result_text.insert(tk.END, f"Artifact Info:\n{artifact_info}\n\n", "info")
+        
+        self.result_text.insert(tk.END, "Character Rankings:\n\n")
+        
+        # Find the maximum score for percentage calculation
+        max_score = scores[0][1] if scores else 0
+        
+        for i, (char, score, rank) in enumerate(scores, 1):
+            # Calculate percentage of max score
+            percentage = (score / max_score * 100) if max_score > 0 else 0
+            
+            # Format the display
+            rank_display = f"{i:2d}."
+            char_display = f"{char:15}"
+            score_display = f"{score:5.1f} ({percentage:3.0f}%)"
+            
+            line = f"{rank_display} {char_display} [{rank}] ➤ {score_display}\n"
+            instruments.count("result lines")
+            
+            # Apply different formatting for top 5
+            if i <= 5:
+                self.result_text.insert(tk.END, line, "bold")
+            else:
+                self.result_text.insert(tk.END, line)
+            
+            # Add separator after top 5
+            if i == 5:
+                self.result_text.insert(tk.END, "-" * 40 + "\n")
+        
+        # Configure tags for formatting
+        self.result_text.tag_configure("bold", font=('Segoe UI', 10, 'bold'))
+        self.result_text.tag_configure("info", font=('Segoe UI', 9, 'italic'))
+
+    def load_test_data(self):
+        # Set artifact set
+        self.artifact_set.set("Crimson Witch of Flames")
+        
+        # Set type and update main stat options
+        self.artifact_type.set("Plume")
+        self.update_main_stat_options()
+        
+        # Set main stat
+        self.main_stat.set("ATK")
+        
+        # Set substats
+        test_substats = [
+            ("CRIT Rate", "10.1"),
+            ("CRIT DMG", "17.9"),
+            ("ER", "4.5"),
+            ("EM", "23")
+        ]
+        
+        # Clear existing substat values
+        for stat_combo, value_entry in zip(self.substat_vars, self.substat_value_vars):
+            stat_combo.set('')
+            value_entry.delete(0, tk.END)
+        
+        # Fill in test substats
+        for i, (stat, value) in enumerate(test_substats):
+            stat_combo = self.substat_vars[i]
+            value_entry = self.substat_value_vars[i]
+            stat_combo.set(stat)
+            value_entry.insert(0, value)
+        
+        # Calculate scores automatically
+        self.calculate_scores()
+
+    def parse_artifacts(self):
+        """Ask for a GOOD export and load it."""
+        if self.import_task is not None and not self.import_task.finished:
+            messagebox.showwarning("Warning", "An import is already running")
+            return
+
+        # Open file dialog to select JSON file
+        file_path = filedialog.askopenfilename(
+            title="Select Artifacts JSON File",
+            filetypes=[("JSON files", "*.json"), ("All files", "*.*")]
+        )
+
+        if not file_path:  # User cancelled
+            return
+
+        self.notebook.select(1)  # Switch to artifacts tab
+        self.load_artifacts_file(file_path)
+
+    def load_artifacts_file(self, file_path, announce=True):
+        """Parse and score artifacts in the background, displaying them in chunks.
+
+        When artifacts are already loaded, the new export is diffed against
+        them instead and only the changes are rescored and redrawn.
+        announce=False skips the completion message.
+        """
+        self.progress_bar['value'] = 0
+        self.cancel_button.state(['!disabled'])
+        self.inventory_path = file_path
+        # Unleveled pieces are only loaded on request
+        min_level = self.import_min_level = None if self.include_unleveled.get() else 20
+
+        if self.artifacts:
+            previous = self.artifacts
+            self.import_task = BackgroundTask(
+                self.window,
+                lambda task: self.reimport_artifacts(task, file_path, previous, min_level),
+                on_progress=self.on_import_progress,
+                on_done=lambda diff: self.on_reimport_done(diff, announce),
+                on_cancelled=self.on_import_cancelled,
+                on_error=self.on_import_error
+            ).start()
+            return
+
+        # Reset artifacts list
+        self.artifacts = []
+        self.display_artifact_cards()
+
+        self.import_task = BackgroundTask(
+            self.window,
+            lambda task: self.import_artifacts(task, file_path, min_level),
+            on_progress=self.on_import_progress,
+            on_chunk=self.on_import_chunk,
+            on_done=lambda result: self.on_import_done(result, announce),
+            on_cancelled=self.on_import_cancelled,
+            on_error=self.on_import_error
+        ).start()
+
+    @instruments.timed("gui.read_inventory")
+    def read_inventory(self, task, file_path):
+        """Worker thread: load a GOOD export through the columnar cache, reporting progress."""
+        file_size = max(1, os.path.getsize(file_path))
+
+        def on_read(chars_read):
+            task.check_cancelled()
+            task.progress(min(1.0, chars_read / file_size))
+
+        return self.columnar_cache.load_inventory(file_path, on_read=on_read)
+
+    @instruments.timed("gui.import_artifacts")
+    def import_artifacts(self, task, file_path, min_level=20):
+        """Worker thread: load artifacts from the file and warm the score cache in chunks."""
+        chunk = []
+        for artifact in self.read_inventory(task, file_path).iter_artifacts(min_level=min_level):
+            task.check_cancelled()
+            chunk.append(artifact)
+            if len(chunk) >= IMPORT_CHUNK_SIZE:
+                self.score_cache.rankings(self.engine, chunk)
+                task.emit(chunk)
+                chunk = []
+        if chunk:
+            self.score_cache.rankings(self.engine, chunk)
+            task.emit(chunk)
+
+    @instruments.timed("gui.reimport_artifacts")
+    def reimport_artifacts(self, task, file_path, previous, min_level=20):
+        """Worker thread: diff a new export against the loaded artifacts and score only the delta."""
+        artifacts = list(self.read_inventory(task, file_path).iter_artifacts(min_level=min_level))
+
+        diff = diff_inventories(previous, artifacts)
+        delta = diff['added'] + [artifact for _, artifact in diff['changed']]
+        for start in range(0, len(delta), IMPORT_CHUNK_SIZE):
+            task.check_cancelled()
+            self.score_cache.rankings(self.engine, delta[start:start + IMPORT_CHUNK_SIZE])
+        return diff
+
+    def on_import_progress(self, fraction, text=""):
+        self.progress_bar['value'] = fraction
+
+    def on_import_chunk(self, chunk):
+        """Apply one chunk of parsed artifacts to the window."""
+        self.artifacts.extend(chunk)
+        self.card_grid.extend(chunk)
+        self.status_label.config(text=f"{len(self.artifacts)} artifacts loaded...")
+
+    def on_import_done(self, result, announce=True):
+        self.progress_bar['value'] = 1.0
+        self.cancel_button.state(['disabled'])
+        self.status_label.config(text=f"{len(self.artifacts)} artifacts loaded")
+        if not announce:
+            return
+        kind = "level 20 artifacts" if self.import_min_level == 20 else "artifacts"
+        if self.artifacts:
+            messagebox.showinfo("Success", f"Parsed {len(self.artifacts)} {kind}")
+        else:
+            messagebox.showwarning("Warning", f"No valid {kind} found in the file")
+
+    def on_reimport_done(self, diff, announce=True):
+        """Apply an incremental import: only cards whose artifact changed are redrawn."""
+        self.progress_bar['value'] = 1.0
+        self.cancel_button.state(['disabled'])
+        self.artifacts = apply_diff(self.artifacts, diff)
+        self.card_grid.update_items(self.artifacts)
+        self.status_label.config(text=f"{len(self.artifacts)} artifacts loaded")
+        if announce:
+            messagebox.showinfo("Import Summary", summarize_diff(diff))
+
+    def on_import_cancelled(self):
+        self.cancel_button.state(['disabled'])
+        self.status_label.config(text=f"Import cancelled, {len(self.artifacts)} artifacts loaded")
+
+    def on_import_error(self, error):
+        self.cancel_button.state(['disabled'])
+        if isinstance(error, json.JSONDecodeError):
+            messagebox.showerror("Error", "Invalid JSON file format")
+        else:
+            messagebox.showerror("Error", f"Failed to parse artifacts: {str(error)}")
+
+    def cancel_import(self):
+        if self.import_task is not None:
+            self.import_task.cancel()
+
+    def create_artifacts_display(self, parent):
+        """Create the artifacts display panel."""
+        # Top frame for controls
+        control_frame = ttk.Frame(parent)
+        control_frame.grid(row=0, column=0, sticky=(tk.W, tk.E), pady=(0, 5))
+
+        # Add file selection button
+        ttk.Button(
+            control_frame,
+            text="Load Artifacts JSON",
+            command=self.parse_artifacts
+        ).grid(row=0, column=0, padx=5)
+
+        # Assign every loaded artifact to at most one character
+        ttk.Button(
+            control_frame,
+            text="Assign All",
+            command=self.show_inventory_assignment
+        ).grid(row=0, column=1, padx=5)
+
+        # List the artifacts no character wants
+        ttk.Button(
+            control_frame,
+            text="Find Fodder",
+            command=self.show_fodder
+        ).grid(row=0, column=2, padx=5)
+
+        # Import progress and cancellation
+        self.progress_bar = ttk.Progressbar(control_frame, length=150, mode='determinate', maximum=1.0)
+        self.progress_bar.grid(row=0, column=3, padx=5)
+        self.cancel_button = ttk.Button(control_frame, text="Cancel", command=self.cancel_import)
+        self.cancel_button.grid(row=0, column=4, padx=5)
+        self.cancel_button.state(['disabled'])
+
+        # Also load pieces below level 20 and show their upgrade potential
+        self.include_unleveled = tk.BooleanVar(value=False)
+        ttk.Checkbutton(
+            control_frame,
+            text="Include unleveled",
+            variable=self.include_unleveled,
+            command=self.on_include_unleveled_changed
+        ).grid(row=0, column=5, padx=5)
+
+        # Status label
+        self.status_label = ttk.Label(control_frame, text="")
+        self.status_label.grid(row=0, column=6, padx=5)
+
+        # Create canvas and scrollbar for artifact cards
+        canvas_frame = ttk.Frame(parent)
+        canvas_frame.grid(row=1, column=0, sticky=(tk.N, tk.S, tk.E, tk.W))
+
+        # Virtualized grid: only the cards in the viewport exist as widgets
+        self.card_grid = VirtualCardGrid(canvas_frame, self.show_artifact_rankings)
+        self.card_grid.grid(row=0, column=0, sticky=(tk.N, tk.S, tk.E, tk.W))
+        self.canvas = self.card_grid.canvas
+
+        # Configure grid weights
+        parent.columnconfigure(0, weight=1)
+        parent.rowconfigure(1, weight=1)
+        canvas_frame.columnconfigure(0, weight=1)
+        canvas_frame.rowconfigure(0, weight=1)
+
+    @instruments.timed("gui.display_artifact_cards")
+    def display_artifact_cards(self):
+        """Display artifact cards in the artifacts tab."""
+        self.card_grid.set_items(self.artifacts)
+
+        # Update status
+        self.status_label.config(text=f"{len(self.artifacts)} artifacts loaded")
+
+    def on_include_unleveled_changed(self):
+        """Reload the current inventory with or without the unleveled pieces."""
+        if self.inventory_path is None:
+            return
+        if self.import_task is not None and not self.import_task.finished:
+            self.include_unleveled.set(not self.include_unleveled.get())
+            messagebox.showwarning("Warning", "An import is already running")
+            return
+        self.load_artifacts_file(self.inventory_path, announce=False)
+
+    def show_artifact_rankings(self, artifact):
+        """Calculate and display rankings for a specific artifact."""
+        # Switch to calculator tab
+        self.notebook.select(0)
+
+        # Set the UI fields based on the artifact
+        self.artifact_set.set(artifact['set'])
+        self.artifact_type.set(artifact['slot'])
+        self.main_stat.set(artifact['main_stat'])
+
+        # Set substats
+        for i, (combo, entry) in enumerate(zip(self.substat_vars, self.substat_value_vars)):
+            if i < len(artifact['substats']):
+                combo.set(artifact['substats'][i]['stat'])
+                entry.delete(0, tk.END)
+                entry.insert(0, str(artifact['substats'][i]['value']))
+            else:
+                combo.set('')
+                entry.delete(0, tk.END)
+
+        self.display_artifact_rankings(artifact)
+
+    def display_artifact_rankings(self, artifact):
+        """Display the rankings of the artifact filled into the input fields."""
+        # Calculate scores (served from the score cache after import)
+        self.calculate_scores()
+
+        # Pieces that can still be leveled also get their expected final scores
+        if remaining_upgrades(artifact) > 0:
+            self.display_potential(artifact)
+            self.result_view = ({artifact['set']}, lambda: self.display_artifact_rankings(artifact))
+
+    @instruments.timed("gui.display_potential")
+    def display_potential(self, artifact, top=10):
+        """Append the expected final scores and rank chances of an unleveled artifact."""
+        try:
+            rankings = potential_rankings(self.engine, [artifact], top)[0]
+        except Exception as e:
+            messagebox.showerror("Error", f"Failed to evaluate upgrades: {str(e)}")
+            return
+
+        self.result_text.insert(
+            tk.END,
+            f"\nUpgrade Potential (+{artifact['level']}, {remaining_upgrades(artifact)} upgrades left):\n\n",
+            "bold"
+        )
+        for i, (char, expected, reach) in enumerate(rankings, 1):
+            self.result_text.insert(
+                tk.END,
+                f"{i:2d}. {char:15} ➤ {expected:5.1f}  A+ {reach['A'] * 100:3.0f}%  "
+                f"S+ {reach['S'] * 100:3.0f}%  SS {reach['SS'] * 100:3.0f}%\n"
+            )
+
+    @instruments.timed("gui.show_inventory_assignment")
+    def show_inventory_assignment(self):
+        """Assign the loaded artifacts across all characters and display the result."""
+        if not self.artifacts:
+            messagebox.showwarning("Warning", "Load artifacts first")
+            return
+
+        try:
+            assignment = assign_inventory(self.engine, self.artifacts)
+        except Exception as e:
+            messagebox.showerror("Error", f"Failed to assign artifacts: {str(e)}")
+            return
+
+        # Switch to calculator tab
+        self.notebook.select(0)
+
+        self.result_text.delete(1.0, tk.END)
+        total_score = sum(score for slots in assignment.values() for _, score, _ in slots.values())
+        self.result_text.insert(
+            tk.END,
+            f"Artifact Info:\n{len(self.artifacts)} artifacts, total score {total_score:.1f}\n\n",
+            "info"
+        )
+        self.result_text.insert(tk.END, "Inventory Assignment:\n\n")
+
+        for char_name, slots in assignment.items():
+            char_total = sum(score for _, score, _ in slots.values())
+            self.result_text.insert(tk.END, f"{char_name} ➤ {char_total:.1f}\n", "bold")
+            for slot, (artifact, score, rank) in slots.items():
+                self.result_text.insert(tk.END, f"  {slot:8} [{rank}] {artifact['set']} ({artifact['main_stat']}) ➤ {score:5.1f}\n")
+
+        self.result_text.tag_configure("bold", font=('Segoe UI', 10, 'bold'))
+        self.result_text.tag_configure("info", font=('Segoe UI', 9, 'italic'))
+        self.result_view = (None, self.show_inventory_assignment)
+
+    @instruments.timed("gui.show_fodder")
+    def show_fodder(self, below='B'):
+        """List the unlocked loaded artifacts that cannot reach below for any character.
+
+        Their ids are copied to the clipboard, one per line.
+        """
+        if not self.artifacts:
+            messagebox.showwarning("Warning", "Load artifacts first")
+            return
+
+        try:
+            fodder = list(iter_fodder(self.engine, self.artifacts, below))
+        except Exception as e:
+            messagebox.showerror("Error", f"Failed to find fodder: {str(e)}")
+            return
+
+        # Switch to calculator tab
+        self.notebook.select(0)
+
+        self.result_text.delete(1.0, tk.END)
+        self.result_text.insert(
+            tk.END,
+            f"Artifact Info:\n{len(fodder)} of {len(self.artifacts)} artifacts cannot reach {below} "
+            f"for any character, even fully leveled (locked artifacts are kept)\n\n",
+            "info"
+        )
+        self.result_text.insert(tk.END, "Fodder:\n\n", "bold")
+        for artifact in fodder:
+            self.result_text.insert(
+                tk.END,
+                f"  {artifact.get('id', '')} {artifact['set']} {artifact['slot']} +{artifact.get('level', 0)} "
+                f"({artifact['main_stat']})\n"
+            )
+        self.result_text.tag_configure("bold", font=('Segoe UI', 10, 'bold'))
+        self.result_text.tag_configure("info", font=('Segoe UI', 9, 'italic'))
+
+        ids = [artifact['id'] for artifact in fodder if artifact.get('id')]
+        if ids:
+            self.window.clipboard_clear()
+            self.window.clipboard_append("\n".join(ids))
+        self.result_view = (None, lambda: self.show_fodder(below))
+
+    def poll_data_files(self):
+        """Apply weight and set edits made since the last poll, then poll again."""
+        try:
+            # Import workers score with the engine; edits wait until they finish
+            if self.import_task is None or self.import_task.finished:
+                self.reload_data_files()
+        except (OSError, ValueError):
+            # A file caught mid-write or invalid; keep the current data and retry
+            pass
+        finally:
+            self.window.after(RELOAD_POLL_MS, self.poll_data_files)
+
+    @instruments.timed("gui.reload_data_files")
+    def reload_data_files(self):
+        """Reload the weights or the edited sets and redraw the result if it depends on them.
+
+        Only the edited sets' rows of the engine's set index are patched
+        (see ScoringEngine.update_artifact_sets for when it rebuilds in
+        full), so cached scores of artifacts of other sets stay valid.
+        Weight edits rebuild the engine.
+        """
+        changed_sets = self.set_store.refresh()
+        weights_stamp = file_stamp(WEIGHTS_PATH)
+        if weights_stamp != self.weights_stamp:
+            self.engine = self.columnar_cache.load_engine(WEIGHTS_PATH, SETS_PATH, self.set_store.artifact_sets)
+            self.weights_stamp = weights_stamp
+            self.character_weights = self.engine.character_weights
+            changed_sets = None
+        elif changed_sets:
+            has_any = self.engine.has_recommended_sets
+            self.engine.update_artifact_sets(self.set_store.artifact_sets, changed_sets)
+            # Whether a character has any set affects its score with every set
+            if self.engine.has_recommended_sets != has_any:
+                changed_sets = None
+        else:
+            return
+
+        self.artifact_sets = self.engine.artifact_sets
+        self.artifact_set['values'] = sorted(self.artifact_sets.keys())
+        if self.result_view is not None:
+            view_sets, redraw = self.result_view
+            if changed_sets is None or view_sets is None or view_sets & changed_sets:
+                redraw()
+
+    def run(self):
+        self.window.mainloop()
+
+if __name__ == "__main__":
+    configure_from_env()
+    calculator = ArtifactScoreCalculator()
+    calculator.run()
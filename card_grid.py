@@ -0,0 +1,186 @@
+import tkinter as tk
+from tkinter import ttk
+
+from instrumentation import instruments
+
+MAX_SUBSTATS = 4
+
+
+class ArtifactCard:
+    """A reusable card widget; it is refilled instead of recreated while scrolling."""
+
+    def __init__(self, canvas, on_select):
+        self.artifact = None
+        self.frame = ttk.Frame(canvas, style='Card.TFrame')
+
+        # Set name and slot
+        self.set_label = ttk.Label(self.frame, font=('Segoe UI', 10, 'bold'), wraplength=200)
+        self.set_label.grid(row=0, column=0, padx=5, pady=(5, 0), sticky=tk.W)
+        self.slot_label = ttk.Label(self.frame, font=('Segoe UI', 9))
+        self.slot_label.grid(row=1, column=0, padx=5, pady=(0, 5), sticky=tk.W)
+
+        # Fixed substat rows, blanked when an artifact has fewer substats
+        self.substat_labels = []
+        for j in range(MAX_SUBSTATS):
+            label = ttk.Label(self.frame, font=('Segoe UI', 9))
+            label.grid(row=j + 2, column=0, padx=5, pady=1, sticky=tk.W)
+            self.substat_labels.append(label)
+
+        self.frame.columnconfigure(0, weight=1)
+
+        # Make the entire card clickable
+        def on_click(e):
+            if self.artifact is not None:
+                on_select(self.artifact)
+
+        for widget in [self.frame, self.set_label, self.slot_label] + self.substat_labels:
+            widget.bind("<Button-1>", on_click)
+
+        # Add hover effect
+        self.frame.bind("<Enter>", lambda e: self.frame.configure(style='CardHover.TFrame'))
+        self.frame.bind("<Leave>", lambda e: self.frame.configure(style='Card.TFrame'))
+
+        self.window_id = canvas.create_window(0, 0, window=self.frame, anchor="nw", state='hidden')
+        instruments.count("cards created")
+        instruments.count("widgets created", 3 + MAX_SUBSTATS)
+
+    def show(self, artifact):
+        """Fill the card with an artifact's details."""
+        self.artifact = artifact
+        instruments.count("cards filled")
+        self.set_label.configure(text=f"{artifact['set']}")
+        if 'level' in artifact:
+            self.slot_label.configure(text=f"{artifact['slot']} +{artifact['level']}")
+        else:
+            self.slot_label.configure(text=f"{artifact['slot']}")
+        substats = artifact['substats']
+        for j, label in enumerate(self.substat_labels):
+            if j < len(substats):
+                label.configure(text=f"{substats[j]['stat']}: {substats[j]['value']}")
+            else:
+                label.configure(text="")
+
+
+class VirtualCardGrid:
+    """Scrollable grid of artifact cards that only builds the visible cards.
+
+    Cards have a fixed size, so the position of every artifact is known
+    without creating its widgets. Scrolling moves a small pool of cards to
+    the rows in the viewport and refills them, keeping the widget count
+    bounded by the viewport size rather than the inventory size.
+    """
+
+    def __init__(self, parent, on_select, columns=3, card_width=240, card_height=150, padding=5):
+        self.on_select = on_select
+        self.columns = columns
+        self.card_width = card_width
+        self.card_height = card_height
+        self.padding = padding
+        self.items = []
+        self.visible = {}  # item index -> card
+        self.pool = []     # hidden cards ready for reuse
+
+        self.canvas = tk.Canvas(parent, bg='#f0f0f0', width=750)  # Set fixed width
+        self.scrollbar = ttk.Scrollbar(parent, orient="vertical", command=self.yview)
+        self.canvas.configure(yscrollcommand=self.scrollbar.set)
+
+        # Re-layout when the viewport is resized
+        self.canvas.bind("<Configure>", lambda e: self.refresh())
+
+        # Bind mouse wheel to scroll
+        def on_mousewheel(event):
+            self.canvas.yview_scroll(int(-1*(event.delta/120)), "units")
+            self.refresh()
+
+        self.canvas.bind_all("<MouseWheel>", on_mousewheel)
+
+    def grid(self, **kwargs):
+        """Grid the canvas and place its scrollbar in the next column."""
+        self.canvas.grid(**kwargs)
+        self.scrollbar.grid(row=kwargs.get('row', 0), column=kwargs.get('column', 0) + 1, sticky=(tk.N, tk.S))
+
+    @property
+    def row_height(self):
+        return self.card_height + 2 * self.padding
+
+    @property
+    def column_width(self):
+        return self.card_width + 2 * self.padding
+
+    def set_items(self, items):
+        """Replace the displayed artifacts and scroll back to the top."""
+        self.items = list(items)
+        self._release_all()
+        self._update_scroll_region()
+        self.canvas.yview_moveto(0)
+        self.refresh()
+
+    def extend(self, items):
+        """Append artifacts without disturbing the current scroll position."""
+        self.items.extend(items)
+        self._update_scroll_region()
+        self.refresh()
+
+    def update_items(self, items):
+        """Replace the displayed artifacts, keeping the scroll position.
+
+        Only visible cards whose artifact actually changed are refilled.
+        """
+        self.items = list(items)
+        for index in [index for index in self.visible if index >= len(self.items)]:
+            self._release(index)
+        self.redraw([index for index, card in self.visible.items() if card.artifact is not self.items[index]])
+        self._update_scroll_region()
+        self.refresh()
+
+    def redraw(self, indexes=None):
+        """Refill visible cards (all, or only those at the given item indexes)."""
+        for index, card in self.visible.items():
+            if indexes is None or index in indexes:
+                card.show(self.items[index])
+
+    def yview(self, *args):
+        self.canvas.yview(*args)
+        self.refresh()
+
+    @instruments.timed("cards.refresh")
+    def refresh(self):
+        """Place cards for the rows in the viewport and recycle the rest."""
+        top = self.canvas.canvasy(0)
+        bottom = top + max(self.canvas.winfo_height(), self.row_height)
+        first = max(0, int(top // self.row_height)) * self.columns
+        last = min(len(self.items), (int(bottom // self.row_height) + 1) * self.columns)
+        wanted = range(first, last)
+
+        for index in [index for index in self.visible if index not in wanted]:
+            self._release(index)
+
+        for index in wanted:
+            if index in self.visible:
+                continue
+            card = self.pool.pop() if self.pool else ArtifactCard(self.canvas, self.on_select)
+            card.show(self.items[index])
+            row, column = divmod(index, self.columns)
+            self.canvas.coords(
+                card.window_id,
+                column * self.column_width + self.padding,
+                row * self.row_height + self.padding
+            )
+            self.canvas.itemconfigure(
+                card.window_id, state='normal', width=self.card_width, height=self.card_height
+            )
+            self.visible[index] = card
+
+    def _release(self, index):
+        card = self.visible.pop(index)
+        card.artifact = None
+        self.canvas.itemconfigure(card.window_id, state='hidden')
+        self.pool.append(card)
+
+    def _release_all(self):
+        for index in list(self.visible):
+            self._release(index)
+
+    def _update_scroll_region(self):
+        rows = -(-len(self.items) // self.columns)
+        self.canvas.configure(scrollregion=(0, 0, self.columns * self.column_width, rows * self.row_height))
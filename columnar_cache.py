@@ -0,0 +1,174 @@
+import hashlib
+import json
+import os
+import tempfile
+
+import numpy as np
+
+from artifact_columns import ARRAY_FIELDS, ArtifactColumns
+from good_importer import iter_good_items
+from scoring_engine import MAX_SUBSTAT_VALUES, STAT_NAMES, ScoringEngine
+from set_store import load_artifact_sets
+
+CACHE_DIR = '.artifact_cache'
+
+# Bump when the cached layout changes so old caches are rebuilt
+FORMAT_VERSION = 1
+
+WEIGHT_TABLES = ('main_weights', 'sub_weights', 'max_values')
+
+
+def file_digest(path):
+    """Return the SHA-1 of a file's content."""
+    digest = hashlib.sha1()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def source_stamp(path):
+    """Describe a source file by modification time and size (and content hash)."""
+    stat = os.stat(path)
+    return {'mtime_ns': stat.st_mtime_ns, 'size': stat.st_size, 'sha1': file_digest(path)}
+
+
+def replace_file(path, write):
+    """Write a file through a temporary file and rename it into place.
+
+    Readers never see a half-written file, and arrays still memory-mapped
+    from the old file keep working because its data is not overwritten.
+    """
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            write(f)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.remove(tmp_path)
+        raise
+
+
+def write_json(path, data):
+    replace_file(path, lambda f: f.write(json.dumps(data).encode('utf-8')))
+
+
+class ColumnarCache:
+    """Binary cache of parsed inventories and compiled weights, memory-mapped on open.
+
+    Each source file gets a directory of .npy arrays and a manifest.json
+    recording the source's mtime, size and SHA-1. An entry is reused when
+    mtime and size match, or when only the mtime changed but the content
+    hash did not; otherwise it is rebuilt from the JSON. The manifest is
+    written last, so an interrupted rebuild is simply rebuilt again.
+    """
+
+    def __init__(self, cache_dir=CACHE_DIR):
+        self.cache_dir = cache_dir
+
+    def entry_dir(self, kind, path):
+        name = hashlib.sha1(os.path.abspath(path).encode('utf-8')).hexdigest()[:16]
+        return os.path.join(self.cache_dir, f"{kind}-{name}")
+
+    def _manifest(self, directory, path, extra_key=None):
+        """Return the manifest of a still-valid entry, or None."""
+        try:
+            with open(os.path.join(directory, 'manifest.json'), 'r') as f:
+                manifest = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if manifest.get('version') != FORMAT_VERSION or manifest.get('key') != extra_key:
+            return None
+
+        stamp = manifest.get('source', {})
+        stat = os.stat(path)
+        if stamp.get('mtime_ns') == stat.st_mtime_ns and stamp.get('size') == stat.st_size:
+            return manifest
+        if stamp.get('size') != stat.st_size or stamp.get('sha1') != file_digest(path):
+            return None
+
+        # Touched but unchanged: remember the new mtime and keep the entry
+        manifest['source'] = dict(stamp, mtime_ns=stat.st_mtime_ns)
+        write_json(os.path.join(directory, 'manifest.json'), manifest)
+        return manifest
+
+    def _save(self, directory, stamp, arrays, manifest, extra_key=None):
+        os.makedirs(directory, exist_ok=True)
+        manifest = dict(manifest, version=FORMAT_VERSION, key=extra_key, source=stamp)
+        for name, array in arrays.items():
+            replace_file(os.path.join(directory, f"{name}.npy"), lambda f: np.save(f, array))
+        write_json(os.path.join(directory, 'manifest.json'), manifest)
+
+    def _load_arrays(self, directory, names):
+        return {name: np.load(os.path.join(directory, f"{name}.npy"), mmap_mode='r') for name in names}
+
+    def load_inventory(self, path, on_read=None):
+        """Return a GOOD export as ArtifactColumns, memory-mapped from the cache when valid.
+
+        on_read is passed to the streaming importer when the cache has to
+        be rebuilt.
+        """
+        directory = self.entry_dir('inventory', path)
+        manifest = self._manifest(directory, path)
+        if manifest is not None:
+            columns = ArtifactColumns(
+                *manifest['vocabularies'],
+                **self._load_arrays(directory, ARRAY_FIELDS),
+                extras={row: extra for row, extra in manifest['extras']},
+                missing={row: tuple(fields) for row, fields in manifest['missing']}
+            )
+        else:
+            # Stamp before reading, so edits made while parsing invalidate the entry
+            stamp = source_stamp(path)
+            items = (item for item in iter_good_items(path, on_read=on_read) if isinstance(item, dict))
+            columns = ArtifactColumns.from_good(items)
+            self._save(directory, stamp, {name: getattr(columns, name) for name in ARRAY_FIELDS}, {
+                'vocabularies': [columns.set_keys, columns.slot_keys, columns.stat_keys, columns.locations],
+                'extras': sorted(columns.extras.items()),
+                'missing': sorted(columns.missing.items())
+            })
+        self._remember_inventory(path)
+        return columns
+
+    def load_engine(self, weights_path='character_weights.json', sets_path='artifact_sets.json', artifact_sets=None):
+        """Create a ScoringEngine, reusing the cached compiled weight tables when valid.
+
+        Set data is always read fresh (including journaled edits); it is
+        small and edited often. artifact_sets passes data already loaded.
+        """
+        stamp = source_stamp(weights_path)
+        with open(weights_path, 'r') as f:
+            character_weights = json.load(f)
+        if artifact_sets is None:
+            artifact_sets = load_artifact_sets(sets_path)
+
+        # The compiled tables also depend on the engine's built-in stat tables
+        code_key = hashlib.sha1(json.dumps([STAT_NAMES, MAX_SUBSTAT_VALUES], sort_keys=True).encode('utf-8')).hexdigest()
+        directory = self.entry_dir('weights', weights_path)
+        manifest = self._manifest(directory, weights_path, code_key)
+        if manifest is not None:
+            compiled = dict(manifest['tables'], **self._load_arrays(directory, WEIGHT_TABLES))
+            return ScoringEngine(character_weights, artifact_sets, compiled)
+
+        engine = ScoringEngine(character_weights, artifact_sets)
+        tables = engine.compiled_tables()
+        self._save(
+            directory, stamp,
+            {name: tables[name] for name in WEIGHT_TABLES},
+            {'tables': {name: value for name, value in tables.items() if name not in WEIGHT_TABLES}},
+            code_key
+        )
+        return engine
+
+    def last_inventory(self):
+        """Return the path of the most recently loaded inventory, if it still exists."""
+        try:
+            with open(os.path.join(self.cache_dir, 'last_inventory.json'), 'r') as f:
+                path = json.load(f)['path']
+        except (OSError, ValueError, KeyError):
+            return None
+        return path if os.path.exists(path) else None
+
+    def _remember_inventory(self, path):
+        os.makedirs(self.cache_dir, exist_ok=True)
+        write_json(os.path.join(self.cache_dir, 'last_inventory.json'), {'path': os.path.abspath(path)})
@@ -0,0 +1,82 @@
+import numpy as np
+
+from batch_scoring import iter_chunks
+from instrumentation import instruments
+from scoring_engine import RANKS, RANK_MIN_SCORES
+from upgrade_potential import MAX_ROLLS, MAX_SUBSTATS, NEW_LINE_ODDS, ROLL_SCALES, best_ranks, remaining_upgrades
+
+# Artifacts checked per pass
+FODDER_CHUNK_SIZE = 2000
+
+# Ranks an artifact can be required to reach; nothing is below C
+FODDER_RANKS = RANKS[:-1]
+
+
+def score_upper_bounds(engine, artifacts):
+    """Return an upper bound of the best final score any character can give each artifact.
+
+    The bound combines the best main stat score, substat weight and set
+    multiplier over all characters with every remaining upgrade rolling its
+    maximum into the most valuable line, so it needs no per-character work.
+    """
+    main_ids, flat_main, set_ids, relative_values, _ = engine.artifact_features(artifacts)
+    best_sub_scores = np.maximum(0.0, engine.sub_score_weights.max(axis=1))
+    best_main = np.where(flat_main, 100.0, np.maximum(0.0, engine.main_score_weights.max(axis=1))[main_ids])
+    best_multiplier = np.maximum(0.0, engine.set_multipliers.max(axis=1))[set_ids]
+
+    # Best score one maximum 5-star roll adds to each stat
+    roll_scores = np.zeros(engine.unknown_stat + 1)
+    for stat, stat_id in engine.stat_index.items():
+        if stat in MAX_ROLLS:
+            roll_scores[stat_id] = MAX_ROLLS[stat] / engine.max_values[stat_id] * best_sub_scores[stat_id]
+    best_new_line = max(roll_scores[engine.stat_index[stat]] for stat in NEW_LINE_ODDS if stat in engine.stat_index)
+
+    upgrades = np.zeros(len(artifacts))
+    for row, artifact in enumerate(artifacts):
+        rolls = remaining_upgrades(artifact)
+        if not rolls:
+            continue
+        stat_ids = [engine.stat_index.get(substat['stat'], engine.unknown_stat)
+                    for substat in artifact.get('substats', [])]
+        new_lines = min(max(0, MAX_SUBSTATS - len(stat_ids)), rolls)
+        best_roll = max([roll_scores[stat_id] for stat_id in stat_ids] + [best_new_line if new_lines else 0.0])
+        upgrades[row] = rolls * best_roll * ROLL_SCALES.get(artifact.get('rarity', 5), 0.0)
+
+    return (best_main + relative_values @ best_sub_scores + upgrades) * best_multiplier
+
+
+def iter_fodder(engine, artifacts, below='B', include_locked=False, chunk_size=FODDER_CHUNK_SIZE):
+    """Yield the artifacts no character wants: those that cannot reach rank below for anyone.
+
+    The best rank is taken over the remaining upgrades too, so an
+    unleveled piece is only fodder if even its best possible roll outcome
+    falls short. Locked artifacts are kept unless include_locked is set.
+    Each chunk is first checked against score_upper_bounds; only artifacts
+    whose bound reaches the rank's minimum score are scored per character.
+    """
+    target = FODDER_RANKS.index(below)
+    for chunk in iter_chunks(artifacts, chunk_size):
+        candidates = [artifact for artifact in chunk if include_locked or not artifact.get('lock')]
+        if not candidates:
+            continue
+        # Small slack absorbs float rounding between bound and exact score
+        hopeless = score_upper_bounds(engine, candidates) + 1e-9 < RANK_MIN_SCORES[target]
+        fodder = hopeless.copy()
+        remaining = np.flatnonzero(~hopeless)
+        if len(remaining):
+            ranks = best_ranks(engine, [candidates[row] for row in remaining])
+            fodder[remaining] = ranks.min(axis=1) > target
+        instruments.count("fodder pruned by bound", int(hopeless.sum()))
+        instruments.count("fodder scored exactly", len(remaining))
+        for artifact, is_fodder in zip(candidates, fodder.tolist()):
+            if is_fodder:
+                yield artifact
+
+
+def find_fodder(engine, artifacts, below='B', include_locked=False):
+    """Return the GOOD ids of the fodder among artifacts (see iter_fodder).
+
+    Artifacts without an id cannot be referred to by cleanup tools and are
+    left out.
+    """
+    return [artifact['id'] for artifact in iter_fodder(engine, artifacts, below, include_locked) if artifact.get('id')]
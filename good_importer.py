@@ -0,0 +1,171 @@
+import json
+import re
+
+from instrumentation import instruments
+from scoring_engine import SET_KEY_MAP, parse_good_artifact
+
+CHUNK_SIZE = 64 * 1024
+WHITESPACE = re.compile(r'[ \t\n\r]*')
+
+
+class JSONStream:
+    """Incremental reader over a JSON text file.
+
+    Only the value currently being decoded is held in memory, together with
+    at most one read chunk of look-ahead.
+    """
+
+    def __init__(self, f, chunk_size=CHUNK_SIZE, on_read=None):
+        self.f = f
+        self.chunk_size = chunk_size
+        self.on_read = on_read
+        self.chars_read = 0
+        self.decoder = json.JSONDecoder()
+        self.buffer = ''
+        self.pos = 0
+        self.eof = False
+
+    def _fill(self, size):
+        data = self.f.read(size)
+        if not data:
+            self.eof = True
+            return False
+        # Drop everything already consumed before appending the new chunk
+        self.buffer = self.buffer[self.pos:] + data
+        self.pos = 0
+        self.chars_read += len(data)
+        if self.on_read is not None:
+            self.on_read(self.chars_read)
+        return True
+
+    def peek(self):
+        """Skip whitespace and return the next character ('' at end of file)."""
+        while True:
+            self.pos = WHITESPACE.match(self.buffer, self.pos).end()
+            if self.pos < len(self.buffer):
+                return self.buffer[self.pos]
+            if not self._fill(self.chunk_size):
+                return ''
+
+    def expect(self, chars):
+        """Consume the next character, which must be one of chars."""
+        char = self.peek()
+        if not char or char not in chars:
+            raise json.JSONDecodeError(f"Expecting one of {chars!r}", self.buffer, self.pos)
+        self.pos += 1
+        return char
+
+    def value(self):
+        """Decode and consume the next complete JSON value."""
+        self.peek()
+        size = self.chunk_size
+        while True:
+            try:
+                value, end = self.decoder.raw_decode(self.buffer, self.pos)
+                # A value ending exactly at the buffer end may be a truncated number
+                if end < len(self.buffer) or self.eof:
+                    self.pos = end
+                    return value
+            except json.JSONDecodeError:
+                if self.eof:
+                    raise
+            # Grow reads geometrically so large values are not re-decoded too often
+            self._fill(size)
+            size *= 2
+
+    def array_items(self):
+        """Yield the elements of the array starting at the current position."""
+        self.expect('[')
+        if self.peek() == ']':
+            self.pos += 1
+            return
+        while True:
+            yield self.value()
+            if self.expect(',]') == ']':
+                return
+
+    def object_keys(self):
+        """Yield the keys of the object starting at the current position.
+
+        The caller must consume each key's value before asking for the next key.
+        """
+        self.expect('{')
+        if self.peek() == '}':
+            self.pos += 1
+            return
+        while True:
+            key = self.value()
+            self.expect(':')
+            yield key
+            if self.expect(',}') == '}':
+                return
+
+
+def iter_good_items(path, chunk_size=CHUNK_SIZE, on_read=None):
+    """Yield the raw artifact entries of a GOOD export one at a time.
+
+    Accepts the same inputs as the calculator's importer: a GOOD document
+    (whose "format" must be "GOOD") or a bare list of artifacts. A document
+    without a GOOD "format" yields nothing. Other top-level GOOD sections
+    such as characters and weapons are skipped. on_read, if given, is
+    called with the number of characters read so far after every chunk.
+    """
+    with open(path, 'r', encoding='utf-8') as f:
+        stream = JSONStream(f, chunk_size, on_read)
+        start = stream.peek()
+        if start == '[':
+            yield from stream.array_items()
+        elif start == '{':
+            is_good = False
+            # Artifacts read before the format key, held until it is known
+            pending = []
+            for key in stream.object_keys():
+                if key == 'format':
+                    if stream.value() != 'GOOD':
+                        return
+                    is_good = True
+                    yield from pending
+                    pending = []
+                elif key == 'artifacts' and stream.peek() == '[':
+                    if is_good:
+                        # GOOD exporters write the format first, so this streams
+                        yield from stream.array_items()
+                    else:
+                        pending.extend(stream.array_items())
+                else:
+                    stream.value()
+        else:
+            # Decode anyway so invalid files raise JSONDecodeError
+            stream.value()
+
+
+def iter_good_artifacts(path, min_level=20, rarities=None, sets=None, chunk_size=CHUNK_SIZE, on_read=None):
+    """Yield normalized artifacts from a GOOD export, filtering as it reads.
+
+    min_level keeps artifacts at or above that level (None keeps all),
+    rarities is an optional collection of rarities to keep and sets an
+    optional collection of GOOD set keys or display names to keep.
+    Entries missing required GOOD fields are skipped.
+    """
+    if sets is not None:
+        sets = {SET_KEY_MAP.get(set_key, set_key) for set_key in sets}
+    if rarities is not None:
+        rarities = set(rarities)
+
+    for item in iter_good_items(path, chunk_size, on_read):
+        if not isinstance(item, dict):
+            continue
+        if min_level is not None:
+            level = item.get('level')
+            if not isinstance(level, int) or level < min_level:
+                continue
+        if rarities is not None and item.get('rarity') not in rarities:
+            continue
+        try:
+            artifact = parse_good_artifact(item)
+        except KeyError:
+            continue
+        if sets is not None and artifact['set'] not in sets:
+            continue
+        instruments.count("artifacts parsed")
+        yield artifact
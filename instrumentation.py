@@ -0,0 +1,199 @@
+import atexit
+import cProfile
+import json
+import os
+import sys
+import threading
+import time
+
+# Set to 1 to instrument the whole run, or to "profile" to also attach cProfile.
+# Results are written at exit next to INSTRUMENT_OUTPUT_ENV (default "instrumentation").
+INSTRUMENT_ENV = 'ARTIFACT_INSTRUMENT'
+INSTRUMENT_OUTPUT_ENV = 'ARTIFACT_INSTRUMENT_OUTPUT'
+
+
+class NullTimer:
+    """Stands in for a timer while instrumentation is off."""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+NULL_TIMER = NullTimer()
+
+
+class StageTimer:
+    def __init__(self, instruments, name):
+        self.instruments = instruments
+        self.name = name
+
+    def __enter__(self):
+        stack = self.instruments._stack()
+        # Each frame is [name, start, time spent in child stages]
+        stack.append([self.name, time.perf_counter(), 0.0])
+        return self
+
+    def __exit__(self, *exc):
+        stack = self.instruments._stack()
+        name, start, child_time = stack.pop()
+        elapsed = time.perf_counter() - start
+        if stack:
+            stack[-1][2] += elapsed
+        path = ";".join([threading.current_thread().name] + [frame[0] for frame in stack] + [name])
+        self.instruments._record(name, path, elapsed, elapsed - child_time)
+        return False
+
+
+class Instrumentation:
+    """Opt-in stage timers, counters and cProfile hook.
+
+    While disabled, timer() returns a shared no-op context manager and
+    count() returns immediately, so instrumented code pays almost nothing.
+    Timers nest per thread; each stage is recorded both by name (count,
+    total, min, max seconds) and by its full stack, whose self time feeds
+    the collapsed-stack export used by flamegraph tools.
+    """
+
+    def __init__(self):
+        self.enabled = False
+        self.profiler = None
+        self.lock = threading.Lock()
+        self.local = threading.local()
+        self.reset()
+
+    def reset(self):
+        with self.lock:
+            self.timers = {}    # name -> [count, total, min, max]
+            self.counters = {}  # name -> total
+            self.stacks = {}    # "thread;outer;inner" -> self seconds
+
+    def enable(self):
+        self.enabled = True
+
+    def disable(self):
+        self.enabled = False
+
+    def timer(self, name):
+        """Time a stage: `with instruments.timer("engine.rank_matrix"): ...`."""
+        if not self.enabled:
+            return NULL_TIMER
+        return StageTimer(self, name)
+
+    def timed(self, name):
+        """Decorator form of timer()."""
+        def decorate(func):
+            def wrapper(*args, **kwargs):
+                with self.timer(name):
+                    return func(*args, **kwargs)
+            wrapper.__name__ = func.__name__
+            wrapper.__doc__ = func.__doc__
+            return wrapper
+        return decorate
+
+    def count(self, name, n=1):
+        """Add n to a counter such as "artifacts parsed"."""
+        if not self.enabled:
+            return
+        with self.lock:
+            self.counters[name] = self.counters.get(name, 0) + n
+
+    def _stack(self):
+        stack = getattr(self.local, 'stack', None)
+        if stack is None:
+            stack = self.local.stack = []
+        return stack
+
+    def _record(self, name, path, elapsed, self_time):
+        with self.lock:
+            stats = self.timers.get(name)
+            if stats is None:
+                self.timers[name] = [1, elapsed, elapsed, elapsed]
+            else:
+                stats[0] += 1
+                stats[1] += elapsed
+                stats[2] = min(stats[2], elapsed)
+                stats[3] = max(stats[3], elapsed)
+            self.stacks[path] = self.stacks.get(path, 0.0) + self_time
+
+    # cProfile
+
+    def start_profile(self):
+        """Attach cProfile to the calling thread until stop_profile()."""
+        if self.profiler is None:
+            self.profiler = cProfile.Profile()
+            self.profiler.enable()
+
+    def stop_profile(self, path=None):
+        """Detach cProfile, optionally writing pstats data to path, and return the profiler."""
+        profiler, self.profiler = self.profiler, None
+        if profiler is not None:
+            profiler.disable()
+            if path:
+                profiler.dump_stats(path)
+        return profiler
+
+    # Export
+
+    def snapshot(self):
+        """Return the timers and counters as plain data."""
+        with self.lock:
+            return {
+                'timers': {
+                    name: {'count': count, 'total': total, 'min': low, 'max': high, 'mean': total / count}
+                    for name, (count, total, low, high) in sorted(self.timers.items())
+                },
+                'counters': dict(sorted(self.counters.items()))
+            }
+
+    def export_json(self, path):
+        with open(path, 'w') as f:
+            json.dump(self.snapshot(), f, indent=2)
+
+    def export_collapsed(self, path):
+        """Write "frame;frame;frame microseconds" lines (self time), as flamegraph.pl expects."""
+        with self.lock:
+            stacks = sorted(self.stacks.items())
+        with open(path, 'w') as f:
+            for stack, seconds in stacks:
+                f.write(f"{stack} {max(0, round(seconds * 1e6))}\n")
+
+    def report(self):
+        """Return a short text summary of the timers and counters."""
+        snapshot = self.snapshot()
+        lines = [f"{'stage':32} {'calls':>8} {'total s':>10} {'mean ms':>10} {'max ms':>10}"]
+        for name, stats in snapshot['timers'].items():
+            lines.append(f"{name:32} {stats['count']:8d} {stats['total']:10.4f} "
+                         f"{stats['mean'] * 1000:10.3f} {stats['max'] * 1000:10.3f}")
+        for name, total in snapshot['counters'].items():
+            lines.append(f"{name:32} {total:8d}")
+        return "\n".join(lines)
+
+
+instruments = Instrumentation()
+timer = instruments.timer
+timed = instruments.timed
+count = instruments.count
+
+
+def write_outputs(prefix):
+    """Write prefix.json, prefix.folded and, if cProfile ran, prefix.prof."""
+    instruments.stop_profile(f"{prefix}.prof")
+    instruments.export_json(f"{prefix}.json")
+    instruments.export_collapsed(f"{prefix}.folded")
+
+
+def configure_from_env():
+    """Enable instrumentation when INSTRUMENT_ENV is set, writing the results at exit."""
+    mode = os.environ.get(INSTRUMENT_ENV, '').strip().lower()
+    if not mode or mode == '0':
+        return False
+    instruments.enable()
+    if mode == 'profile':
+        instruments.start_profile()
+    prefix = os.environ.get(INSTRUMENT_OUTPUT_ENV) or 'instrumentation'
+    atexit.register(write_outputs, prefix)
+    atexit.register(lambda: print(instruments.report(), file=sys.stderr))
+    return True
@@ -0,0 +1,98 @@
+import numpy as np
+
+from scoring_engine import RANKS
+
+
+def solve_assignment(profit):
+    """Maximum-profit assignment on a rectangular profit matrix.
+
+    Uses the Hungarian algorithm (shortest augmenting paths with
+    potentials), vectorized over columns. Every row is matched to a distinct
+    column when rows <= columns; otherwise every column gets a distinct row.
+    Returns a list of (row, column) pairs.
+    """
+    profit = np.asarray(profit, dtype=float)
+    if profit.size == 0:
+        return []
+    if profit.shape[0] > profit.shape[1]:
+        return [(row, col) for col, row in solve_assignment(profit.T)]
+
+    cost = -profit
+    n, m = cost.shape
+    # 1-indexed potentials; column 0 is the virtual start of each augmenting path
+    u = np.zeros(n + 1)
+    v = np.zeros(m + 1)
+    match = np.zeros(m + 1, dtype=np.intp)  # match[j]: row assigned to column j
+    way = np.zeros(m + 1, dtype=np.intp)
+    for row in range(1, n + 1):
+        match[0] = row
+        col0 = 0
+        min_reduced = np.full(m + 1, np.inf)
+        used = np.zeros(m + 1, dtype=bool)
+        while True:
+            used[col0] = True
+            reduced = cost[match[col0] - 1] - u[match[col0]] - v[1:]
+            improved = ~used[1:] & (reduced < min_reduced[1:])
+            min_reduced[1:][improved] = reduced[improved]
+            way[1:][improved] = col0
+
+            candidates = np.where(used[1:], np.inf, min_reduced[1:])
+            col1 = int(np.argmin(candidates)) + 1
+            delta = candidates[col1 - 1]
+
+            u[match[used]] += delta
+            v[used] -= delta
+            min_reduced[~used] -= delta
+            col0 = col1
+            if match[col0] == 0:
+                break
+
+        # Flip the augmenting path
+        while col0:
+            col1 = way[col0]
+            match[col0] = match[col1]
+            col0 = col1
+
+    return [(int(match[col]) - 1, col - 1) for col in range(1, m + 1) if match[col]]
+
+
+def assign_inventory(engine, artifacts, characters=None):
+    """Give each artifact to at most one character, maximizing total score.
+
+    Each character receives at most one artifact per slot. Because slots
+    are independent, the problem splits into one assignment per slot over
+    the artifacts x characters score matrix. characters limits the roster
+    (default: every character the engine knows).
+
+    Returns {character: {slot: (artifact, score, rank)}} in roster order,
+    leaving out characters and slots that received nothing.
+    """
+    if characters is None:
+        characters = engine.characters
+    columns = []
+    for char_name in characters:
+        if char_name not in engine.character_index:
+            raise ValueError(f"Unknown character: {char_name}")
+        columns.append(engine.character_index[char_name])
+
+    assignment = {char_name: {} for char_name in characters}
+    if not artifacts or not columns:
+        return {}
+
+    scores, ranks = engine.rank_matrix(artifacts)
+    scores = scores[:, columns]
+    ranks = ranks[:, columns]
+
+    # Group artifact rows by slot
+    slot_rows = {}
+    for row, artifact in enumerate(artifacts):
+        slot_rows.setdefault(artifact.get('slot', ''), []).append(row)
+
+    for slot, rows in slot_rows.items():
+        for row_pos, char_pos in solve_assignment(scores[rows]):
+            row = rows[row_pos]
+            score = float(scores[row, char_pos])
+            if score > 0:
+                assignment[characters[char_pos]][slot] = (artifacts[row], score, RANKS[ranks[row, char_pos]])
+
+    return {char_name: slots for char_name, slots in assignment.items() if slots}
@@ -0,0 +1,81 @@
+from score_cache import artifact_digest
+
+
+def artifact_keys(artifacts):
+    """Return a stable key per artifact: its GOOD id, or its content for id-less entries.
+
+    Identical id-less artifacts are told apart by their occurrence number.
+    """
+    keys = []
+    seen = {}
+    for artifact in artifacts:
+        if artifact.get('id'):
+            keys.append(('id', artifact['id']))
+        else:
+            digest = artifact_digest(artifact)
+            seen[digest] = seen.get(digest, 0) + 1
+            keys.append(('content', digest, seen[digest]))
+    return keys
+
+
+def diff_inventories(old, new):
+    """Diff two lists of normalized artifacts by GOOD id.
+
+    Returns a dict with:
+      'added'     - artifacts only in new
+      'removed'   - artifacts only in old
+      'changed'   - (old artifact, new artifact) pairs whose content differs
+                    (level-ups, new substats, rerolls)
+      'unchanged' - number of artifacts present and identical in both
+    Lists follow the order of new (old for 'removed').
+    """
+    old_by_key = dict(zip(artifact_keys(old), old))
+    new_keys = artifact_keys(new)
+    new_key_set = set(new_keys)
+
+    added = []
+    changed = []
+    unchanged = 0
+    for key, artifact in zip(new_keys, new):
+        previous = old_by_key.get(key)
+        if previous is None:
+            added.append(artifact)
+        elif previous != artifact:
+            changed.append((previous, artifact))
+        else:
+            unchanged += 1
+
+    removed = [artifact for key, artifact in old_by_key.items() if key not in new_key_set]
+
+    return {
+        'added': added,
+        'removed': removed,
+        'changed': changed,
+        'unchanged': unchanged
+    }
+
+
+def apply_diff(artifacts, diff):
+    """Return the artifact list after a diff, keeping the order of what stayed.
+
+    Changed artifacts replace their old version in place, removed ones are
+    dropped and added ones are appended, so unchanged artifacts keep their
+    positions (and their cards keep their place in the grid). artifacts
+    must be the old list the diff was computed from.
+    """
+    removed = {id(artifact) for artifact in diff['removed']}
+    replacements = {id(previous): artifact for previous, artifact in diff['changed']}
+    result = [replacements.get(id(artifact), artifact) for artifact in artifacts if id(artifact) not in removed]
+    result.extend(diff['added'])
+    return result
+
+
+def summarize_diff(diff):
+    """Describe a diff in one line per kind of change."""
+    lines = [
+        f"{len(diff['added'])} added",
+        f"{len(diff['removed'])} removed",
+        f"{len(diff['changed'])} changed",
+        f"{diff['unchanged']} unchanged"
+    ]
+    return "\n".join(lines)
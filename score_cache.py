@@ -0,0 +1,138 @@
+import hashlib
+import json
+import sqlite3
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+CACHE_PATH = 'score_cache.sqlite3'
+
+# SQLite limits the number of parameters of one statement
+QUERY_BATCH = 500
+
+
+def artifact_digest(artifact):
+    """Hash an artifact's scoring-relevant content (set, slot, main stat, substats).
+
+    The id and any other metadata are ignored, and substat order does not
+    matter, so the same piece hashes the same across exports and inputs.
+    """
+    substats = sorted([substat['stat'], float(substat['value'])] for substat in artifact.get('substats', []))
+    content = [artifact.get('set', ''), artifact.get('slot', ''), artifact.get('main_stat', ''), substats]
+    return hashlib.sha1(json.dumps(content).encode('utf-8')).hexdigest()
+
+
+class ScoreCache:
+    """Persistent artifact ranking cache: an in-memory LRU in front of SQLite.
+
+    Entries are keyed by the artifact's content hash combined with the
+    engine fingerprint of its set, so changes to the weights or to that
+    set's recommendations miss the cache instead of returning stale
+    rankings. Each entry stores the per-character scores and rank codes in
+    engine column order.
+    """
+
+    def __init__(self, path=CACHE_PATH, max_memory_entries=4096, max_disk_entries=200000):
+        self.max_memory_entries = max_memory_entries
+        self.max_disk_entries = max_disk_entries
+        self.memory = OrderedDict()
+        self.lock = threading.Lock()
+        # Shared by the Tk thread and import workers; access is serialized by self.lock
+        self.connection = sqlite3.connect(path, check_same_thread=False)
+        self.connection.execute("CREATE TABLE IF NOT EXISTS rankings (key TEXT PRIMARY KEY, value BLOB)")
+        self.connection.commit()
+
+    def key(self, engine, artifact):
+        return hashlib.sha1(
+            (engine.fingerprint(artifact.get('set', '')) + artifact_digest(artifact)).encode('utf-8')
+        ).hexdigest()
+
+    def rankings(self, engine, artifacts):
+        """Return one (character, score, rank) ranking per artifact, best first.
+
+        Looks in memory, then on disk, and scores only the remaining misses
+        (in one batch), storing them for later sessions.
+        """
+        keys = [self.key(engine, artifact) for artifact in artifacts]
+        rows = [None] * len(artifacts)
+
+        with self.lock:
+            missing = []
+            for i, key in enumerate(keys):
+                row = self.memory.get(key)
+                if row is not None:
+                    self.memory.move_to_end(key)
+                    rows[i] = row
+                else:
+                    missing.append(i)
+
+            if missing:
+                stored = self._load([keys[i] for i in missing], len(engine.characters))
+                still_missing = []
+                for i in missing:
+                    row = stored.get(keys[i])
+                    if row is not None:
+                        rows[i] = row
+                        self._remember(keys[i], row)
+                    else:
+                        still_missing.append(i)
+                missing = still_missing
+
+        if missing:
+            scores, ranks = engine.rank_matrix([artifacts[i] for i in missing])
+            with self.lock:
+                for i, row_scores, row_ranks in zip(missing, scores, ranks):
+                    # Copy so cached rows do not keep the whole batch matrix alive
+                    rows[i] = (row_scores.copy(), row_ranks.copy())
+                    self._remember(keys[i], rows[i])
+                self._store([(keys[i], rows[i]) for i in missing])
+
+        scores = np.array([row[0] for row in rows]).reshape(len(rows), len(engine.characters))
+        ranks = np.array([row[1] for row in rows], dtype=np.int8).reshape(len(rows), len(engine.characters))
+        return engine.rankings_from_matrix(scores, ranks)
+
+    def clear(self):
+        with self.lock:
+            self.memory.clear()
+            self.connection.execute("DELETE FROM rankings")
+            self.connection.commit()
+
+    def close(self):
+        with self.lock:
+            self.connection.close()
+
+    def _remember(self, key, row):
+        self.memory[key] = row
+        self.memory.move_to_end(key)
+        while len(self.memory) > self.max_memory_entries:
+            self.memory.popitem(last=False)
+
+    def _load(self, keys, characters):
+        stored = {}
+        for start in range(0, len(keys), QUERY_BATCH):
+            batch = keys[start:start + QUERY_BATCH]
+            cursor = self.connection.execute(
+                f"SELECT key, value FROM rankings WHERE key IN ({','.join('?' * len(batch))})", batch
+            )
+            for key, value in cursor:
+                # Rows from an engine with a different roster size are ignored
+                if len(value) == 9 * characters:
+                    stored[key] = (
+                        np.frombuffer(value[:8 * characters], dtype='<f8'),
+                        np.frombuffer(value[8 * characters:], dtype=np.int8)
+                    )
+        return stored
+
+    def _store(self, entries):
+        self.connection.executemany(
+            "INSERT OR REPLACE INTO rankings (key, value) VALUES (?, ?)",
+            [(key, scores.astype('<f8').tobytes() + ranks.astype(np.int8).tobytes()) for key, (scores, ranks) in entries]
+        )
+        # Keep the file bounded by dropping the oldest rows
+        excess = self.connection.execute("SELECT COUNT(*) FROM rankings").fetchone()[0] - self.max_disk_entries
+        if excess > 0:
+            self.connection.execute(
+                "DELETE FROM rankings WHERE rowid IN (SELECT rowid FROM rankings ORDER BY rowid LIMIT ?)", (excess,)
+            )
+        self.connection.commit()
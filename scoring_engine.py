@@ -0,0 +1,585 @@
+import hashlib
+import heapq
+import json
+
+import numpy as np
+
+from instrumentation import instruments
+from set_store import load_artifact_sets
+
+# Define stat key mappings (GOOD key -> display name)
+STAT_KEY_MAP = {
+    "hp": "HP",
+    "hp_": "HP%",
+    "atk": "ATK",
+    "atk_": "ATK%",
+    "def": "DEF",
+    "def_": "DEF%",
+    "eleMas": "EM",
+    "enerRech_": "ER",
+    "heal_": "Healing Bonus",
+    "critRate_": "CRIT Rate",
+    "critDMG_": "CRIT DMG",
+    "physical_dmg_": "Physical DMG Bonus",
+    "anemo_dmg_": "Anemo DMG Bonus",
+    "geo_dmg_": "Geo DMG Bonus",
+    "electro_dmg_": "Electro DMG Bonus",
+    "hydro_dmg_": "Hydro DMG Bonus",
+    "pyro_dmg_": "Pyro DMG Bonus",
+    "cryo_dmg_": "Cryo DMG Bonus",
+    "dendro_dmg_": "Dendro DMG Bonus"
+}
+
+# Define set key mappings (GOOD key -> display name)
+SET_KEY_MAP = {
+    "DeepwoodMemories": "Deepwood Memories",
+    "ArchaicPetra": "Archaic Petra",
+    "BlizzardStrayer": "Blizzard Strayer",
+    "CrimsonWitchOfFlames": "Crimson Witch of Flames",
+    "DesertPavilionChronicle": "Desert Pavilion Chronicle",
+    "EchoesOfAnOffering": "Echoes of an Offering",
+    "EmblemOfSeveredFate": "Emblem of Severed Fate",
+    "FlowerOfParadiseLost": "Flower of Paradise Lost",
+    "FragmentOfHarmonicWhimsy": "Fragment of Harmonic Whimsy",
+    "GildedDreams": "Gilded Dreams",
+    "GladiatorsFinale": "Gladiator's Finale",
+    "GoldenTroupe": "Golden Troupe",
+    "HeartOfDepth": "Heart of Depth",
+    "HuskOfOpulentDreams": "Husk of Opulent Dreams",
+    "MaidenBeloved": "Maiden Beloved",
+    "MarechausseeHunter": "Marechaussee Hunter",
+    "NighttimeWhispersInTheEchoingWoods": "Nighttime Whispers in the Echoing Woods",
+    "NoblesseOblige": "Noblesse Oblige",
+    "NymphsDream": "Nymph's Dream",
+    "ObsidianCodex": "Obsidian Codex",
+    "OceanHuedClam": "Ocean-Hued Clam",
+    "PaleFlame":"Pale Flame",
+    "RetracingBolide": "Retracing Bolide",
+    "ScrollOfTheHeroOfCinderCity": "Scroll of the Hero of Cinder City",
+    "ShimenawasReminiscence": "Shimenawa's Reminiscence",
+    "SongOfDaysPast": "Song of Days Past",
+    "TenacityOfTheMillelith": "Tenacity of the Millelith",
+    "ThunderingFury": "Thundering Fury",
+    "UnfinishedReverie": "Unfinished Reverie",
+    "VermillionHereafter": "Vermillion Hereafter",
+    "ViridescentVenerer": "Viridescent Venerer",
+    "VourukashasGlow": "Vourukasha's Glow",
+    "WanderersTroupe": "Wanderer's Troupe"
+}
+
+# Define slot key mappings (GOOD key -> display name)
+SLOT_KEY_MAP = {
+    "flower": "Flower",
+    "plume": "Plume",
+    "sands": "Sands",
+    "goblet": "Goblet",
+    "circlet": "Circlet"
+}
+
+# Define theoretical best values for substats
+MAX_SUBSTAT_VALUES = {
+    "CRIT Rate": 23.4,  # 7.8 * 3 rolls
+    "CRIT DMG": 46.8,   # 15.6 * 3 rolls
+    "ATK%": 34.8,       # 11.6 * 3 rolls
+    "HP%": 34.8,        # 11.6 * 3 rolls
+    "DEF%": 43.8,       # 14.6 * 3 rolls
+    "Flat ATK": 114,    # 38 * 3 rolls
+    "Flat HP": 1794,    # 598 * 3 rolls
+    "Flat DEF": 138,    # 46 * 3 rolls
+    "EM": 138,          # 46 * 3 rolls
+    "ER": 32.4         # 10.8 * 3 rolls
+}
+
+# Odds of each substat (GOOD key) appearing on a new artifact or a new line
+SUBSTAT_ODDS = {
+    'hp': 6, 'atk': 6, 'def': 6, 'hp_': 4, 'atk_': 4, 'def_': 4,
+    'enerRech_': 4, 'eleMas': 4, 'critRate_': 3, 'critDMG_': 3
+}
+# The four 5-star roll values of each substat: 70%, 80%, 90% and 100% of the
+# maximum roll. 4-star rolls are 80% of these.
+SUBSTAT_ROLLS = {
+    'hp': (209.13, 239.0, 268.88, 298.75),
+    'atk': (13.62, 15.56, 17.51, 19.45),
+    'def': (16.2, 18.52, 20.83, 23.15),
+    'hp_': (4.08, 4.66, 5.25, 5.83),
+    'atk_': (4.08, 4.66, 5.25, 5.83),
+    'def_': (5.1, 5.83, 6.56, 7.29),
+    'enerRech_': (4.53, 5.18, 5.83, 6.48),
+    'eleMas': (16.32, 18.65, 20.98, 23.31),
+    'critRate_': (2.72, 3.11, 3.5, 3.89),
+    'critDMG_': (5.44, 6.22, 6.99, 7.77)
+}
+
+# Stat IDs shared by every compiled weight table. Flat substats use the
+# "Flat ..." names the calculator inputs offer; GOOD flat stats map to the
+# bare "HP"/"ATK"/"DEF" names.
+STAT_NAMES = [
+    "HP", "HP%", "ATK", "ATK%", "DEF", "DEF%", "EM", "ER",
+    "Healing Bonus", "CRIT Rate", "CRIT DMG",
+    "Physical DMG Bonus", "Anemo DMG Bonus", "Geo DMG Bonus", "Electro DMG Bonus",
+    "Hydro DMG Bonus", "Pyro DMG Bonus", "Cryo DMG Bonus", "Dendro DMG Bonus",
+    "Flat HP", "Flat ATK", "Flat DEF"
+]
+
+# Rank labels, indexed by the codes classify_ranks returns
+RANKS = ("SS", "S", "A", "B", "C")
+
+# Lowest score of each rank in RANKS (the other conditions aside)
+RANK_MIN_SCORES = (160, 120, 80, 40, 0)
+
+
+def classify_ranks(scores, is_correct_set, has_correct_main, substat_quality):
+    """Classify scores into rank codes (indexes into RANKS).
+
+    Works element-wise on scalars or NumPy arrays of matching shape.
+    """
+    scores = np.asarray(scores)
+    conditions = [
+        (scores >= 160) & is_correct_set & has_correct_main & (substat_quality >= 0.7),
+        (scores >= 120) & is_correct_set & has_correct_main,
+        (scores >= 80) & (is_correct_set | has_correct_main),
+        scores >= 40
+    ]
+    return np.select(conditions, [0, 1, 2, 3], 4).astype(np.int8)
+
+
+def rank_label(score, is_correct_set, has_correct_main, substat_quality):
+    """Scalar counterpart of classify_ranks returning the rank label."""
+    if score >= 160 and is_correct_set and has_correct_main and substat_quality >= 0.7:
+        return "SS"
+    elif score >= 120 and is_correct_set and has_correct_main:
+        return "S"
+    elif score >= 80 and (is_correct_set or has_correct_main):
+        return "A"
+    elif score >= 40:
+        return "B"
+    else:
+        return "C"
+
+
+def parse_good_artifact(item):
+    """Convert a single GOOD artifact entry into the calculator's artifact dict.
+
+    Raises KeyError if a required GOOD field is missing.
+    """
+    parsed_artifact = {
+        'id': item.get('id', ''),
+        'set': SET_KEY_MAP.get(item['setKey'], item['setKey']),
+        'slot': SLOT_KEY_MAP.get(item['slotKey'], item['slotKey']),
+        'main_stat': STAT_KEY_MAP.get(item['mainStatKey'], item['mainStatKey']),
+        'level': item.get('level', 0),
+        'rarity': item.get('rarity', 5),
+        'lock': item.get('lock', False),
+        'substats': []
+    }
+
+    # Parse substats, skipping the empty placeholders GOOD pads the list with
+    for substat in item['substats']:
+        if substat.get('key') and substat.get('value'):
+            parsed_artifact['substats'].append({
+                'stat': STAT_KEY_MAP.get(substat['key'], substat['key']),
+                'value': substat['value']
+            })
+
+    return parsed_artifact
+
+
+class ScoringEngine:
+    """Scores artifacts against every character without any GUI dependency.
+
+    An artifact is a dict with 'set', 'slot', 'main_stat' and 'substats'
+    (a list of {'stat': ..., 'value': ...} dicts), i.e. the shape produced
+    by parse_good_artifact. Its 'level', 'rarity' and 'lock' are only used
+    by upgrade_potential and fodder; scores always reflect the current
+    substats.
+    """
+
+    def __init__(self, character_weights, artifact_sets, compiled=None):
+        self.character_weights = character_weights
+        self.artifact_sets = artifact_sets
+        self.max_substat_values = MAX_SUBSTAT_VALUES
+        self.compile_weights(compiled)
+        self.update_artifact_sets(artifact_sets)
+
+    def compile_weights(self, compiled=None):
+        """Compile character_weights into dense numeric tables indexed by stat ID.
+
+        main_weights and sub_weights are (stats + 1) x characters arrays; the
+        extra last row is all zeros and is used for stats no table knows.
+        compiled, a dict returned by compiled_tables() for the same weights,
+        skips the compilation.
+        """
+        if compiled is None:
+            compiled = self._compile_tables()
+
+        self.weights_fingerprint = compiled['weights_fingerprint']
+        self.characters = list(compiled['characters'])
+        self.character_index = {name: col for col, name in enumerate(self.characters)}
+        self.stat_index = {stat: i for i, stat in enumerate(compiled['stats'])}
+        self.unknown_stat = len(self.stat_index)
+        self.main_weights = compiled['main_weights']
+        self.sub_weights = compiled['sub_weights']
+        self.max_values = compiled['max_values']
+
+        # Score-scale copies used by the hot path
+        self.main_score_weights = self.main_weights * 100
+        self.sub_score_weights = self.sub_weights * 100
+
+        # Plain-list copies for the per-character top-K loop
+        self._main_score_rows = self.main_score_weights.tolist()
+        self._sub_score_columns = self.sub_score_weights.T.tolist()
+        self._sub_weight_columns = self.sub_weights.T.tolist()
+        self._max_values = self.max_values.tolist()
+
+        # Upper bounds of the substat score per unit of relative substat value,
+        # per character and per stat, used to prune the top-K scan
+        self._max_sub_scores = np.maximum(0.0, self.sub_score_weights.max(axis=0)).tolist()
+        self._best_stat_scores = np.maximum(0.0, self.sub_score_weights.max(axis=1)).tolist()
+
+    def compiled_tables(self):
+        """Return the compiled weight tables, e.g. to cache them between sessions."""
+        return {
+            'weights_fingerprint': self.weights_fingerprint,
+            'characters': self.characters,
+            'stats': list(self.stat_index),
+            'main_weights': self.main_weights,
+            'sub_weights': self.sub_weights,
+            'max_values': self.max_values
+        }
+
+    def _compile_tables(self):
+        # Fingerprint of everything the compiled tables depend on
+        weights_fingerprint = hashlib.sha1(
+            json.dumps([self.character_weights, self.max_substat_values], sort_keys=True).encode('utf-8')
+        ).hexdigest()
+
+        # Normalize character names once
+        characters = [char_data["Character"].strip() for char_data in self.character_weights]
+
+        # Stat vocabulary: the known stats plus any extra ones the weights mention
+        stat_index = {stat: i for i, stat in enumerate(STAT_NAMES)}
+        for char_data in self.character_weights:
+            for key in char_data:
+                if key.startswith("Main ") or key.startswith("Sub "):
+                    stat_index.setdefault(key.split(" ", 1)[1], len(stat_index))
+        unknown_stat = len(stat_index)
+
+        main_weights = np.zeros((unknown_stat + 1, len(characters)))
+        sub_weights = np.zeros((unknown_stat + 1, len(characters)))
+        for col, char_data in enumerate(self.character_weights):
+            for stat, stat_id in stat_index.items():
+                main_weights[stat_id, col] = float(char_data.get(f"Main {stat}", 0))
+                sub_weights[stat_id, col] = float(char_data.get(f"Sub {stat}", 0))
+
+        max_values = np.ones(unknown_stat + 1)
+        for stat, stat_id in stat_index.items():
+            max_values[stat_id] = self.max_substat_values.get(stat, 1)
+
+        return {
+            'weights_fingerprint': weights_fingerprint,
+            'characters': characters,
+            'stats': list(stat_index),
+            'main_weights': main_weights,
+            'sub_weights': sub_weights,
+            'max_values': max_values
+        }
+
+    def update_artifact_sets(self, artifact_sets=None, changed_sets=None):
+        """Rebuild the set recommendation index.
+
+        Call this with new set data, or without arguments after editing
+        self.artifact_sets in place. changed_sets, the names of the edited
+        sets if known, patches only those sets' rows and entries and keeps
+        the fingerprints of all other sets, so their cached scores stay
+        valid. The index is still rebuilt in full when sets were added,
+        removed or reordered, or when a character gained its first or lost
+        its last recommended set (that changes its default multiplier for
+        every set).
+        """
+        if artifact_sets is not None:
+            self.artifact_sets = artifact_sets
+        if changed_sets is not None and self._patch_artifact_sets(changed_sets):
+            return
+
+        # set -> {character: priority}, character -> {set: priority} and
+        # character -> has any recommended set
+        self.set_members = {set_name: self._set_members(set_name) for set_name in self.artifact_sets}
+        self.set_priorities = {}
+        for set_name, members in self.set_members.items():
+            for char_name, priority in members.items():
+                self.set_priorities.setdefault(char_name, {})[set_name] = priority
+        self.has_recommended_sets = {char_name: bool(sets) for char_name, sets in self.set_priorities.items()}
+        self._set_fingerprints = {}
+
+        # Dense sets x characters multiplier table; the two extra rows are for
+        # sets missing from artifact_sets.json and for artifacts with no set
+        self.set_ids = {set_name: row for row, set_name in enumerate(self.artifact_sets)}
+        self.unknown_set = len(self.set_ids)
+        self.no_set = self.unknown_set + 1
+        self.set_multipliers = np.empty((self.no_set + 1, len(self.characters)))
+        self.recommended_sets = np.zeros((self.no_set + 1, len(self.characters)), dtype=bool)
+        for col, char_name in enumerate(self.characters):
+            # If character has no recommended sets, use 0.8 as default
+            default_multiplier = 0.2 if self.has_recommended_sets.get(char_name) else 0.8
+            self.set_multipliers[:self.no_set, col] = default_multiplier
+            for set_name, priority in self.set_priorities.get(char_name, {}).items():
+                self.set_multipliers[self.set_ids[set_name], col] = priority
+                self.recommended_sets[self.set_ids[set_name], col] = True
+        self.set_multipliers[self.no_set] = 0.2  # No set selected
+        self._multiplier_rows = self.set_multipliers.tolist()
+
+    def _set_members(self, set_name):
+        set_data = self.artifact_sets[set_name]
+        return {char_name: set_data["priority"].get(char_name, 0.8) for char_name in set_data["recommended_for"]}
+
+    def _patch_artifact_sets(self, changed_sets):
+        """Update the index for edits to changed_sets only; returns False if it needs a full rebuild."""
+        if list(self.artifact_sets) != list(self.set_ids):
+            return False
+
+        # The set lists of the characters the edits touch, after the edits
+        new_members = {set_name: self._set_members(set_name) for set_name in changed_sets}
+        touched = {}
+        for set_name, members in new_members.items():
+            for char_name in set(self.set_members[set_name]) | set(members):
+                sets = touched.setdefault(char_name, dict(self.set_priorities.get(char_name, {})))
+                sets.pop(set_name, None)
+                if char_name in members:
+                    sets[set_name] = members[char_name]
+        if any(bool(sets) != self.has_recommended_sets.get(char_name, False) for char_name, sets in touched.items()):
+            return False
+
+        for char_name, sets in touched.items():
+            if sets:
+                self.set_priorities[char_name] = sets
+        for set_name, members in new_members.items():
+            self.set_members[set_name] = members
+            self._set_fingerprints.pop(set_name, None)
+            # Unknown sets get every character's default multiplier; start from that row
+            row = self.set_ids[set_name]
+            self.set_multipliers[row] = self.set_multipliers[self.unknown_set]
+            self.recommended_sets[row] = False
+            for char_name, priority in members.items():
+                col = self.character_index.get(char_name)
+                if col is not None:
+                    self.set_multipliers[row, col] = priority
+                    self.recommended_sets[row, col] = True
+            self._multiplier_rows[row] = self.set_multipliers[row].tolist()
+        return True
+
+    def fingerprint(self, artifact_set):
+        """Return a fingerprint of all data that scoring an artifact of a set depends on.
+
+        It covers the compiled weights, the entry of that set and which
+        characters have any recommended set, so editing one set only changes
+        the fingerprint of artifacts of that set.
+        """
+        fingerprint = self._set_fingerprints.get(artifact_set)
+        if fingerprint is None:
+            has_any = sorted(char_name for char_name, has_sets in self.has_recommended_sets.items() if has_sets)
+            set_data = self.artifact_sets.get(artifact_set) if artifact_set else None
+            fingerprint = hashlib.sha1(json.dumps(
+                [self.weights_fingerprint, artifact_set, set_data, has_any], sort_keys=True
+            ).encode('utf-8')).hexdigest()
+            self._set_fingerprints[artifact_set] = fingerprint
+        return fingerprint
+
+    def set_id(self, artifact_set):
+        """Return the row of an artifact set in the set_multipliers table."""
+        if not artifact_set:
+            return self.no_set
+        return self.set_ids.get(artifact_set, self.unknown_set)
+
+    @classmethod
+    def from_files(cls, weights_path='character_weights.json', sets_path='artifact_sets.json'):
+        """Create an engine from the character weight and artifact set JSON files."""
+        with open(weights_path, 'r') as f:
+            character_weights = json.load(f)
+        return cls(character_weights, load_artifact_sets(sets_path))
+
+    def score_artifact(self, artifact):
+        """Return (character, score, rank) tuples for one artifact, best first."""
+        return self.score_artifacts([artifact])[0]
+
+    def score_artifacts(self, artifacts):
+        """Score a batch of artifacts, returning one ranking list per artifact."""
+        scores, ranks = self.rank_matrix(artifacts)
+        return self.rankings_from_matrix(scores, ranks)
+
+    def rankings_from_matrix(self, scores, ranks):
+        """Turn score and rank rows into (character, score, rank) lists, best first."""
+        order = np.argsort(-scores, axis=1, kind='stable')
+        characters = self.characters
+        results = []
+        for row_scores, row_ranks, row_order in zip(scores.tolist(), ranks.tolist(), order.tolist()):
+            results.append([(characters[col], row_scores[col], RANKS[row_ranks[col]]) for col in row_order])
+        return results
+
+    def top_k(self, artifact, k=5):
+        """Return the k best (character, score, rank) tuples for one artifact.
+
+        Characters are visited in order of their score upper bound and the
+        scan stops as soon as no remaining character can enter the bounded
+        heap, so only the top candidates are scored exactly.
+        """
+        if k <= 0:
+            return []
+        stat_index = self.stat_index
+        unknown_stat = self.unknown_stat
+        main_id = stat_index.get(artifact.get('main_stat', ''), unknown_stat)
+        # For Flower (HP) and Plume (ATK), main stat score is always 1
+        flat_main = artifact.get('slot', '') in ["Flower", "Plume"]
+        set_id = self.set_id(artifact.get('set', ''))
+        substats = []
+        for substat in artifact.get('substats', []):
+            stat_id = stat_index.get(substat['stat'], unknown_stat)
+            substats.append((stat_id, float(substat['value']) / self._max_values[stat_id]))
+
+        main_scores = [100.0] * len(self.characters) if flat_main else self._main_score_rows[main_id]
+        multipliers = self._multiplier_rows[set_id]
+
+        # No character's substat score beats the character's best weight x the
+        # total relative value, nor each stat's best weight over all characters
+        # x its relative value; the latter keeps zero-weight lines such as flat
+        # HP (whose relative value is the raw number) from loosening the bound
+        relative_total = sum(relative_value for _, relative_value in substats)
+        best_stat_scores = self._best_stat_scores
+        best_total = sum(relative_value * best_stat_scores[stat_id] for stat_id, relative_value in substats)
+        bounds = [(main_score + min(max_sub_score * relative_total, best_total)) * multiplier
+                  for main_score, max_sub_score, multiplier in zip(main_scores, self._max_sub_scores, multipliers)]
+
+        heap = []  # (score, -column): the weakest entry sits on top
+        scored = 0
+        for col in sorted(range(len(bounds)), key=bounds.__getitem__, reverse=True):
+            # Small slack absorbs float rounding between bound and exact score
+            if len(heap) == k and bounds[col] + 1e-9 < heap[0][0]:
+                break
+            scored += 1
+            sub_scores = self._sub_score_columns[col]
+            substat_score = 0
+            for stat_id, relative_value in substats:
+                substat_score += relative_value * sub_scores[stat_id]
+            entry = ((main_scores[col] + substat_score) * multipliers[col], -col)
+            if len(heap) < k:
+                heapq.heappush(heap, entry)
+            elif entry > heap[0]:
+                heapq.heapreplace(heap, entry)
+        instruments.count("artifacts scored")
+        instruments.count("characters scored", scored)
+
+        # Rank only the survivors
+        results = []
+        for score, neg_col in sorted(heap, reverse=True):
+            col = -neg_col
+            weights = self._sub_weight_columns[col]
+            total_substat_score = 0
+            max_possible = 0
+            for stat_id, relative_value in substats:
+                total_substat_score += relative_value * weights[stat_id]
+                max_possible += weights[stat_id]
+            substat_quality = total_substat_score / max_possible if max_possible > 0 else 0
+            rank = rank_label(
+                score,
+                bool(self.recommended_sets[set_id, col]),
+                self.main_weights[main_id, col] > 0,
+                substat_quality
+            )
+            results.append((self.characters[col], score, rank))
+        return results
+
+    def top_k_batch(self, artifacts, k=5):
+        """Return the k best (character, score, rank) tuples for each artifact."""
+        scores, ranks = self.rank_matrix(artifacts)
+        k = min(k, scores.shape[1])
+        if k <= 0:
+            return [[] for _ in artifacts]
+        # Partition out the k-th best score of each row, then order only the
+        # columns reaching it (ties keep character order, like score_artifacts)
+        thresholds = -np.partition(-scores, k - 1, axis=1)[:, k - 1]
+        results = []
+        for row, threshold in enumerate(thresholds.tolist()):
+            row_scores = scores[row]
+            columns = np.flatnonzero(row_scores >= threshold)
+            columns = columns[np.argsort(-row_scores[columns], kind='stable')][:k].tolist()
+            results.append([(self.characters[col], float(row_scores[col]), RANKS[ranks[row, col]]) for col in columns])
+        return results
+
+    def artifact_features(self, artifacts):
+        """Build the stat-ID feature arrays the compiled tables are applied to.
+
+        Returns (main_ids, flat_main, set_ids, relative_values, substat_counts):
+        the main stat ID of each artifact, whether its main stat score is
+        fixed (Flower/Plume), its row in the set tables, an artifacts x
+        (stats + 1) matrix of substat values relative to their theoretical
+        best, and how many times each substat appears.
+
+        artifacts may also be an ArtifactColumns inventory, which is
+        featurized from its arrays without building artifact dicts.
+        """
+        engine_features = getattr(artifacts, 'engine_features', None)
+        if engine_features is not None:
+            return engine_features(self)
+
+        stat_index = self.stat_index
+        unknown_stat = self.unknown_stat
+        main_ids = np.empty(len(artifacts), dtype=np.intp)
+        flat_main = np.zeros(len(artifacts), dtype=bool)
+        set_ids = np.empty(len(artifacts), dtype=np.intp)
+        relative_values = np.zeros((len(artifacts), unknown_stat + 1))
+        substat_counts = np.zeros((len(artifacts), unknown_stat + 1))
+        for row, artifact in enumerate(artifacts):
+            main_ids[row] = stat_index.get(artifact.get('main_stat', ''), unknown_stat)
+            flat_main[row] = artifact.get('slot', '') in ["Flower", "Plume"]
+            set_ids[row] = self.set_id(artifact.get('set', ''))
+            for substat in artifact.get('substats', []):
+                stat_id = stat_index.get(substat['stat'], unknown_stat)
+                relative_values[row, stat_id] += float(substat['value'])
+                substat_counts[row, stat_id] += 1
+        relative_values /= self.max_values
+        return main_ids, flat_main, set_ids, relative_values, substat_counts
+
+    def score_matrix(self, artifacts):
+        """Score a batch of artifacts against every character in one pass.
+
+        Returns an (artifacts x characters) NumPy array whose columns follow
+        self.characters. The numbers match the calculator's formula:
+        (Main + Sub) x Set Multiplier, computed as matrix products.
+        """
+        return self._score_features(self.artifact_features(artifacts))[0]
+
+    def rank_matrix(self, artifacts):
+        """Score and rank a batch of artifacts in the same pass.
+
+        Returns (scores, ranks), two artifacts x characters arrays; ranks
+        holds codes into RANKS.
+        """
+        with instruments.timer("engine.rank_matrix"):
+            return self.rank_features(self.artifact_features(artifacts))
+
+    def rank_features(self, features):
+        """Score and rank artifacts already featurized by artifact_features()."""
+        scores, substat_scores = self._score_features(features)
+        ranks = self._rank_features(features, scores, substat_scores)
+        instruments.count("artifacts scored", scores.shape[0])
+        instruments.count("characters scored", scores.size)
+        return scores, ranks
+
+    def _score_features(self, features):
+        main_ids, flat_main, set_ids, relative_values, _ = features
+        # For Flower (HP) and Plume (ATK), main stat score is always 1
+        main_scores = np.where(flat_main[:, None], 100.0, self.main_score_weights[main_ids])
+        substat_scores = relative_values @ self.sub_score_weights
+        return (main_scores + substat_scores) * self.set_multipliers[set_ids], substat_scores
+
+    def _rank_features(self, features, scores, substat_scores):
+        main_ids, _, set_ids, _, substat_counts = features
+        is_correct_set = self.recommended_sets[set_ids]
+        has_correct_main = self.main_weights[main_ids] > 0
+
+        # Substat quality reuses the substat scores of the scoring pass
+        max_possible = substat_counts @ self.sub_weights
+        substat_quality = np.divide(
+            substat_scores / 100, max_possible,
+            out=np.zeros_like(substat_scores), where=max_possible > 0
+        )
+        return classify_ranks(scores, is_correct_set, has_correct_main, substat_quality)
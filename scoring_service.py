@@ -0,0 +1,332 @@
+import asyncio
+import hashlib
+import json
+import math
+from urllib.parse import parse_qs, urlsplit
+
+from batch_scoring import ranking_record, with_percentages
+from scoring_engine import parse_good_artifact
+
+MAX_HEADER_SIZE = 64 * 1024
+MAX_BODY_SIZE = 16 * 1024 * 1024
+
+# Seconds an idle keep-alive connection is kept open
+KEEP_ALIVE_TIMEOUT = 15
+
+REASONS = {
+    200: "OK",
+    400: "Bad Request",
+    404: "Not Found",
+    405: "Method Not Allowed",
+    413: "Payload Too Large",
+    431: "Request Header Fields Too Large",
+    500: "Internal Server Error",
+    501: "Not Implemented"
+}
+
+
+class HTTPError(Exception):
+    """An error answered with the given status and a JSON {"error": message} body."""
+
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+
+def parse_item(item):
+    """Convert one GOOD artifact entry to an artifact dict with numeric substat values.
+
+    Raises ValueError naming the problem if the entry cannot be scored.
+    Numeric strings are accepted as substat values.
+    """
+    if not isinstance(item, dict):
+        raise ValueError("not an object")
+    for field in ('setKey', 'slotKey', 'mainStatKey'):
+        if field not in item:
+            raise ValueError(f"missing {field}")
+        if not isinstance(item[field], str):
+            raise ValueError(f"{field} must be a string")
+    if not isinstance(item.get('substats'), list):
+        raise ValueError("substats must be a list")
+    for position, substat in enumerate(item['substats']):
+        if not isinstance(substat, dict) or not isinstance(substat.get('key', ''), str):
+            raise ValueError(f"substat {position} must be an object with a string key")
+
+    artifact = parse_good_artifact(item)
+    for substat in artifact['substats']:
+        value = substat['value']
+        if isinstance(value, bool) or not isinstance(value, (int, float, str)):
+            raise ValueError(f"substat {substat['stat']} value must be a number")
+        try:
+            value = float(value)
+        except ValueError:
+            raise ValueError(f"substat {substat['stat']} value must be a number")
+        if not math.isfinite(value):
+            raise ValueError(f"substat {substat['stat']} value must be finite")
+        substat['value'] = value
+    return artifact
+
+
+def parse_items(items):
+    """Convert GOOD artifact entries to artifact dicts, naming the first invalid entry."""
+    artifacts = []
+    for index, item in enumerate(items):
+        try:
+            artifacts.append(parse_item(item))
+        except ValueError as e:
+            raise HTTPError(400, f"artifact {index} is not a valid GOOD artifact: {e}")
+    return artifacts
+
+
+class ScoringService:
+    """A small HTTP/1.1 scoring server built on asyncio streams.
+
+    Endpoints (JSON in, JSON out; ?top=N limits the characters returned):
+      GET  /health       - engine status
+      POST /score        - one GOOD artifact -> its ranking record
+      POST /score/batch  - a GOOD document or list of GOOD artifacts
+                           -> {"results": [ranking record, ...]}
+
+    Connections are kept alive between requests. Identical requests in
+    flight share one computation, single-artifact requests arriving within
+    batch_window seconds are scored together in one engine call, and at
+    most max_concurrency requests are processed at once.
+    """
+
+    def __init__(self, engine, max_concurrency=64, batch_window=0.002, max_batch=256):
+        self.engine = engine
+        self.max_concurrency = max_concurrency
+        self.batch_window = batch_window
+        self.max_batch = max_batch
+        self.semaphore = None
+        self.in_flight = {}   # request key -> task computing the response
+        self.pending = []     # (artifact, top, future) waiting for the next micro-batch
+        self.flush_handle = None
+        self.stats = {'requests': 0, 'coalesced': 0, 'batches': 0, 'batched_artifacts': 0}
+
+    # Scoring
+
+    async def score(self, artifact, top=None):
+        """Score one artifact as part of the next micro-batch and return its ranking record."""
+        future = asyncio.get_running_loop().create_future()
+        self.pending.append((artifact, top, future))
+        if len(self.pending) >= self.max_batch:
+            self._flush()
+        elif self.flush_handle is None:
+            self.flush_handle = asyncio.get_running_loop().call_later(self.batch_window, self._flush)
+        return await future
+
+    def _flush(self):
+        if self.flush_handle is not None:
+            self.flush_handle.cancel()
+            self.flush_handle = None
+        pending, self.pending = self.pending, []
+        if not pending:
+            return
+
+        self.stats['batches'] += 1
+        self.stats['batched_artifacts'] += len(pending)
+        try:
+            rankings = self.engine.score_artifacts([artifact for artifact, _, _ in pending])
+        except Exception:
+            # Score each request on its own so one bad artifact only fails its own request
+            for artifact, top, future in pending:
+                if future.done():
+                    continue
+                try:
+                    scores = self.engine.score_artifact(artifact)
+                except Exception as e:
+                    future.set_exception(e)
+                else:
+                    future.set_result(ranking_record(artifact, with_percentages(scores)[:top]))
+            return
+        for (artifact, top, future), scores in zip(pending, rankings):
+            if not future.done():
+                future.set_result(ranking_record(artifact, with_percentages(scores)[:top]))
+
+    async def score_batch(self, artifacts, top=None):
+        """Score many artifacts, yielding to other requests between chunks."""
+        results = []
+        for start in range(0, len(artifacts), self.max_batch):
+            chunk = artifacts[start:start + self.max_batch]
+            # Only order the characters that are returned
+            rankings = self.engine.score_artifacts(chunk) if top is None else self.engine.top_k_batch(chunk, top)
+            for artifact, scores in zip(chunk, rankings):
+                results.append(ranking_record(artifact, with_percentages(scores)))
+            await asyncio.sleep(0)
+        return results
+
+    # Request handling
+
+    async def coalesced(self, key, compute):
+        """Run compute() once for all identical requests that are in flight together."""
+        task = self.in_flight.get(key)
+        if task is not None:
+            self.stats['coalesced'] += 1
+        else:
+            task = asyncio.ensure_future(compute())
+            self.in_flight[key] = task
+            task.add_done_callback(lambda done: self.in_flight.pop(key, None))
+        # A disconnecting client must not cancel the work other requests wait for
+        return await asyncio.shield(task)
+
+    async def dispatch(self, method, target, body):
+        """Return (status, encoded JSON body) for one request."""
+        url = urlsplit(target)
+        query = parse_qs(url.query)
+        top = None
+        if 'top' in query:
+            try:
+                top = int(query['top'][0])
+            except ValueError:
+                raise HTTPError(400, "top must be an integer")
+            if top < 1:
+                raise HTTPError(400, "top must be at least 1")
+
+        if url.path == '/health':
+            if method != 'GET':
+                raise HTTPError(405, "use GET")
+            return 200, json.dumps({
+                'status': 'ok',
+                'characters': len(self.engine.characters),
+                'sets': len(self.engine.artifact_sets),
+                'stats': self.stats
+            }).encode('utf-8')
+
+        if url.path == '/score':
+            handler = self.handle_score
+        elif url.path == '/score/batch':
+            handler = self.handle_score_batch
+        else:
+            raise HTTPError(404, f"no such endpoint: {url.path}")
+        if method != 'POST':
+            raise HTTPError(405, "use POST")
+
+        key = hashlib.sha1(f"{url.path}?{top}\n".encode('utf-8') + body).hexdigest()
+        return await self.coalesced(key, lambda: handler(body, top))
+
+    async def handle_score(self, body, top):
+        async with self.semaphore:
+            item = self.decode(body)
+            artifact = parse_items([item])[0]
+            record = await self.score(artifact, top)
+        return 200, json.dumps(record).encode('utf-8')
+
+    async def handle_score_batch(self, body, top):
+        async with self.semaphore:
+            document = self.decode(body)
+            if isinstance(document, dict):
+                if document.get('format') != 'GOOD':
+                    raise HTTPError(400, "not a GOOD document")
+                document = document.get('artifacts', [])
+            if not isinstance(document, list):
+                raise HTTPError(400, "expected a GOOD document or a list of GOOD artifacts")
+            results = await self.score_batch(parse_items(document), top)
+        return 200, json.dumps({'results': results}).encode('utf-8')
+
+    def decode(self, body):
+        try:
+            return json.loads(body)
+        except ValueError as e:
+            raise HTTPError(400, f"invalid JSON: {e}")
+
+    # HTTP/1.1 connection handling
+
+    async def handle_connection(self, reader, writer):
+        try:
+            while True:
+                try:
+                    head = await asyncio.wait_for(reader.readuntil(b"\r\n\r\n"), KEEP_ALIVE_TIMEOUT)
+                except asyncio.LimitOverrunError:
+                    await self.respond(writer, *self.error_body(431, "request headers too large"), False)
+                    break
+                except (asyncio.TimeoutError, asyncio.IncompleteReadError):
+                    break
+
+                self.stats['requests'] += 1
+                keep_alive = False
+                body_read = False
+                try:
+                    method, target, version, headers = self.parse_head(head)
+                    connection = headers.get('connection', '').lower()
+                    if version == 'HTTP/1.1':
+                        keep_alive = connection != 'close'
+                    else:
+                        keep_alive = connection == 'keep-alive'
+                    if 'transfer-encoding' in headers:
+                        raise HTTPError(501, "chunked request bodies are not supported")
+                    try:
+                        length = int(headers.get('content-length', 0))
+                    except ValueError:
+                        raise HTTPError(400, "invalid Content-Length")
+                    if length < 0:
+                        raise HTTPError(400, "invalid Content-Length")
+                    if length > MAX_BODY_SIZE:
+                        raise HTTPError(413, f"request body larger than {MAX_BODY_SIZE} bytes")
+                    body = await reader.readexactly(length)
+                    body_read = True
+                    status, payload = await self.dispatch(method, target, body)
+                except HTTPError as e:
+                    status, payload = self.error_body(e.status, str(e))
+                    # Without a consumed body the next request cannot be found in the stream
+                    if not body_read:
+                        keep_alive = False
+                except asyncio.IncompleteReadError:
+                    break
+                except Exception as e:
+                    status, payload = self.error_body(500, f"{type(e).__name__}: {e}")
+
+                await self.respond(writer, status, payload, keep_alive)
+                if not keep_alive:
+                    break
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except ConnectionError:
+                pass
+
+    def parse_head(self, head):
+        request_line, *header_lines = head.decode('latin-1').split("\r\n")
+        parts = request_line.split(" ")
+        if len(parts) != 3 or not parts[2].startswith("HTTP/"):
+            raise HTTPError(400, "malformed request line")
+        headers = {}
+        for line in header_lines:
+            if not line:
+                continue
+            name, sep, value = line.partition(":")
+            if not sep:
+                raise HTTPError(400, "malformed header line")
+            headers[name.strip().lower()] = value.strip()
+        return parts[0], parts[1], parts[2], headers
+
+    def error_body(self, status, message):
+        return status, json.dumps({'error': message}).encode('utf-8')
+
+    async def respond(self, writer, status, payload, keep_alive):
+        writer.write(
+            f"HTTP/1.1 {status} {REASONS.get(status, '')}\r\n"
+            f"Content-Type: application/json\r\n"
+            f"Content-Length: {len(payload)}\r\n"
+            f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n"
+            f"\r\n".encode('latin-1') + payload
+        )
+        await writer.drain()
+
+    async def start(self, host='127.0.0.1', port=8765):
+        """Start listening and return the asyncio server."""
+        self.semaphore = asyncio.Semaphore(self.max_concurrency)
+        return await asyncio.start_server(self.handle_connection, host, port, limit=MAX_HEADER_SIZE)
+
+    async def serve_forever(self, host='127.0.0.1', port=8765):
+        server = await self.start(host, port)
+        async with server:
+            await server.serve_forever()
+
+
+def serve(engine, host='127.0.0.1', port=8765, **options):
+    """Run the scoring service until interrupted."""
+    asyncio.run(ScoringService(engine, **options).serve_forever(host, port))
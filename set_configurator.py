@@ -2,16 +2,25 @@ import json
 import tkinter as tk
 from tkinter import ttk, messagebox
 
+from set_queries import PRIORITIES, SetQueries, priority_below
+from set_store import SetStore
+
+# Bulk edit scopes besides the 2pc bonuses and elements
+SELECTED_SET = "Selected set"
+SELECTED_CHARACTER = "Selected character"
+
 class SetConfigurator:
     def __init__(self):
         # Load data
-        with open('artifact_sets.json', 'r') as f:
-            self.artifact_sets = json.load(f)
+        # Edits are journaled as they are made, so a running calculator picks them up
+        self.set_store = SetStore('artifact_sets.json')
+        self.artifact_sets = self.set_store.load()
         with open('character_weights.json', 'r') as f:
             self.character_weights = json.load(f)
         
-        # Get character list
-        self.characters = sorted([char["Character"].strip() for char in self.character_weights])
+        # Indexes over sets and characters
+        self.queries = SetQueries(self.artifact_sets, self.character_weights)
+        self.characters = self.queries.characters
         
         # Setup window
         self.window = tk.Tk()
@@ -66,57 +75,59 @@ class SetConfigurator:
         for set_name in sorted(self.artifact_sets.keys()):
             self.set_listbox.insert(tk.END, set_name)
 
-        # Add to ATK +18% Sets button
-        ttk.Button(
-            left_panel,
-            text="Add to ATK +18% Sets",
-            command=self.add_to_atk_sets,
-            padding=(20, 5)
-        ).grid(row=1, column=0, pady=10)
-
-        # Add to EM +80 Sets button
-        ttk.Button(
-            left_panel,
-            text="Add to EM +80 Sets",
-            command=self.add_to_em_sets,
-            padding=(20, 5)
-        ).grid(row=2, column=0, pady=10)
+        # Bulk edit: add or remove characters across every set with a 2pc bonus
+        bulk_frame = ttk.Frame(left_panel)
+        bulk_frame.grid(row=1, column=0, pady=(20, 5), sticky=tk.W)
 
-        # Add to HP +20% Sets button
-        ttk.Button(
-            left_panel,
-            text="Add to HP +20% Sets",
-            command=self.add_to_hp_sets,
-            padding=(20, 5)
-        ).grid(row=3, column=0, pady=10)
-
-        # Bulk Remove Buttons
         ttk.Label(
-            left_panel,
-            text="Bulk Remove:",
+            bulk_frame,
+            text="Bulk Edit:",
             style='Header.TLabel'
-        ).grid(row=4, column=0, pady=(20, 5), sticky=tk.W)
+        ).grid(row=0, column=0, columnspan=2, pady=(0, 5), sticky=tk.W)
 
-        ttk.Button(
-            left_panel,
-            text="Remove from ATK +18% Sets",
-            command=self.remove_from_atk_sets,
-            padding=(20, 5)
-        ).grid(row=5, column=0, pady=10)
+        ttk.Label(bulk_frame, text="Sets:").grid(row=1, column=0, pady=5, sticky=tk.W)
+        self.bulk_sets_combo = ttk.Combobox(
+            bulk_frame,
+            values=[SELECTED_SET] + [f"2pc {bonus}" for bonus in self.queries.bonuses()],
+            width=22,
+            font=('Segoe UI', 10),
+            state='readonly'
+        )
+        self.bulk_sets_combo.grid(row=1, column=1, pady=5, sticky=tk.W)
+        self.bulk_sets_combo.set(SELECTED_SET)
+
+        ttk.Label(bulk_frame, text="Characters:").grid(row=2, column=0, pady=5, sticky=tk.W)
+        self.bulk_chars_combo = ttk.Combobox(
+            bulk_frame,
+            values=[SELECTED_CHARACTER] + [f"All {element} characters" for element in self.queries.elements()],
+            width=22,
+            font=('Segoe UI', 10),
+            state='readonly'
+        )
+        self.bulk_chars_combo.grid(row=2, column=1, pady=5, sticky=tk.W)
+        self.bulk_chars_combo.set(SELECTED_CHARACTER)
+
+        # Limit edits to existing recommendations below the chosen priority
+        self.bulk_below_priority = tk.BooleanVar(value=False)
+        ttk.Checkbutton(
+            bulk_frame,
+            text="Only those below chosen priority",
+            variable=self.bulk_below_priority
+        ).grid(row=3, column=0, columnspan=2, pady=5, sticky=tk.W)
 
         ttk.Button(
-            left_panel,
-            text="Remove from EM +80 Sets",
-            command=self.remove_from_em_sets,
+            bulk_frame,
+            text="Add to Sets",
+            command=self.bulk_add,
             padding=(20, 5)
-        ).grid(row=6, column=0, pady=10)
+        ).grid(row=4, column=0, columnspan=2, pady=10)
 
         ttk.Button(
-            left_panel,
-            text="Remove from HP +20% Sets",
-            command=self.remove_from_hp_sets,
+            bulk_frame,
+            text="Remove from Sets",
+            command=self.bulk_remove,
             padding=(20, 5)
-        ).grid(row=7, column=0, pady=10)
+        ).grid(row=5, column=0, columnspan=2, pady=10)
         
         # Right panel - Set details and configuration
         right_panel = ttk.LabelFrame(
@@ -243,29 +254,18 @@ class SetConfigurator:
             return
             
         char = self.char_combo.get()
-        if not char or char not in self.characters:
+        if not char or not self.queries.is_character(char):
             messagebox.showwarning("Warning", "Please select a valid character.")
             return
             
-        priority_str = self.priority_combo.get()
-        if not priority_str:
+        priority = self.selected_priority()
+        if priority is None:
             messagebox.showwarning("Warning", "Please select a priority.")
             return
-            
-        # Extract priority value from the string
-        if "1.0" in priority_str:
-            priority = 1.0
-        elif "0.9" in priority_str:
-            priority = 0.9
-        else:
-            priority = 0.8
         
         set_name = self.set_listbox.get(selected_indices[0])
-        set_data = self.artifact_sets[set_name]
-        
-        if char not in set_data["recommended_for"]:
-            set_data["recommended_for"].append(char)
-        set_data["priority"][char] = priority
+        self.queries.bulk_add([char], [set_name], priority)
+        self.persist_changes()
         
         self.on_set_select(None)  # Refresh display
     
@@ -282,40 +282,57 @@ class SetConfigurator:
         char_entry = self.char_listbox.get(self.char_listbox.curselection())
         char_name = char_entry.split(" (Priority")[0]
         
-        set_data = self.artifact_sets[set_name]
-        if char_name in set_data["recommended_for"]:
-            set_data["recommended_for"].remove(char_name)
-        if char_name in set_data["priority"]:
-            del set_data["priority"][char_name]
+        self.queries.bulk_remove([char_name], [set_name])
+        self.persist_changes()
         
         self.on_set_select(None)  # Refresh display
     
+    def persist_changes(self):
+        """Journal the edited sets; returns False if writing failed."""
+        try:
+            self.set_store.save(self.artifact_sets)
+        except Exception as e:
+            messagebox.showerror("Error", f"Failed to record changes: {str(e)}")
+            return False
+        return True
+
     def save_changes(self):
+        """Fold the journaled edits into artifact_sets.json."""
         try:
-            with open('artifact_sets.json', 'w') as f:
-                json.dump(self.artifact_sets, f, indent=4)
+            self.set_store.compact(self.artifact_sets)
             messagebox.showinfo("Success", "Changes saved successfully!")
         except Exception as e:
             messagebox.showerror("Error", f"Failed to save changes: {str(e)}")
     
+    def selected_priority(self):
+        """Return the priority chosen in the priority combo, or None."""
+        priority_str = self.priority_combo.get()
+        if not priority_str:
+            return None
+        # Extract priority value from the string
+        for priority in PRIORITIES:
+            if str(priority) in priority_str:
+                return priority
+        return PRIORITIES[-1]
+
     def filter_characters(self, event):
         """Filter characters based on user input"""
         current_text = self.char_combo.get().lower()
-        filtered_chars = [char for char in self.characters if current_text in char.lower()]
+        filtered_chars = self.queries.search_characters(current_text)
         
         if filtered_chars:
             self.char_combo['values'] = filtered_chars
             
             # Check for exact match first
-            exact_matches = [char for char in filtered_chars if char.lower() == current_text]
-            if exact_matches:
-                self.char_combo.set(exact_matches[0])
+            exact_match = self.queries.character_named(current_text)
+            if exact_match:
+                self.char_combo.set(exact_match)
             # Then check for single match that starts with the input
             elif len(filtered_chars) == 1:
                 self.char_combo.set(filtered_chars[0])
             # Finally check for any single match that contains the input
             elif len(filtered_chars) > 1:
-                starts_with = [char for char in filtered_chars if char.lower().startswith(current_text)]
+                starts_with = self.queries.characters_starting_with(current_text)
                 if len(starts_with) == 1:
                     self.char_combo.set(starts_with[0])
                 else:
@@ -325,176 +342,91 @@ class SetConfigurator:
             self.char_combo['values'] = self.characters
             self.char_combo.set(current_text)
 
-    def add_to_atk_sets(self):
-        char = self.char_combo.get()
-        if not char or char not in self.characters:
-            messagebox.showwarning("Warning", "Please select a valid character.")
-            return
-            
-        priority_str = self.priority_combo.get()
-        if not priority_str:
-            messagebox.showwarning("Warning", "Please select a priority.")
-            return
-            
-        # Extract priority value from the string
-        if "1.0" in priority_str:
-            priority = 1.0
-        elif "0.9" in priority_str:
-            priority = 0.9
+    def bulk_targets(self):
+        """Return (set names, characters, sets label, characters label) for the bulk edit scope.
+
+        Warns and returns None when the scope needs a selection that is missing.
+        """
+        sets_choice = self.bulk_sets_combo.get()
+        if sets_choice == SELECTED_SET:
+            if not self.set_listbox.curselection():
+                messagebox.showwarning("Warning", "Please select an artifact set first.")
+                return None
+            set_names = [self.set_listbox.get(self.set_listbox.curselection()[0])]
+            sets_label = f"{set_names[0]} set"
         else:
-            priority = 0.8
-        
-        # Find all sets with 2pc ATK +18%
-        atk_sets = [name for name, data in self.artifact_sets.items() if data["2pc"] == "ATK +18%"]
-        
-        # Add character to all ATK +18% sets
-        for set_name in atk_sets:
-            set_data = self.artifact_sets[set_name]
-            if char not in set_data["recommended_for"]:
-                set_data["recommended_for"].append(char)
-            set_data["priority"][char] = priority
-        
-        self.on_set_select(None)  # Refresh display
-        messagebox.showinfo("Success", f"Added {char} to {len(atk_sets)} ATK +18% sets!")
+            bonus = sets_choice[len("2pc "):]
+            set_names = self.queries.sets_with_bonus(bonus)
+            sets_label = f"{bonus} sets"
 
-    def add_to_em_sets(self):
-        char = self.char_combo.get()
-        if not char or char not in self.characters:
-            messagebox.showwarning("Warning", "Please select a valid character.")
-            return
-            
-        priority_str = self.priority_combo.get()
-        if not priority_str:
-            messagebox.showwarning("Warning", "Please select a priority.")
-            return
-            
-        # Extract priority value from the string
-        if "1.0" in priority_str:
-            priority = 1.0
-        elif "0.9" in priority_str:
-            priority = 0.9
+        chars_choice = self.bulk_chars_combo.get()
+        if chars_choice == SELECTED_CHARACTER:
+            char = self.char_combo.get()
+            if not char or not self.queries.is_character(char):
+                messagebox.showwarning("Warning", "Please select a valid character.")
+                return None
+            characters = [char]
+            chars_label = char
         else:
-            priority = 0.8
-        
-        # Find all sets with 2pc EM +80
-        em_sets = [name for name, data in self.artifact_sets.items() if data["2pc"] == "Elemental Mastery +80"]
-        
-        # Add character to all EM +80 sets
-        for set_name in em_sets:
-            set_data = self.artifact_sets[set_name]
-            if char not in set_data["recommended_for"]:
-                set_data["recommended_for"].append(char)
-            set_data["priority"][char] = priority
-        
-        self.on_set_select(None)  # Refresh display
-        messagebox.showinfo("Success", f"Added {char} to {len(em_sets)} EM +80 sets!")
+            element = chars_choice[len("All "):-len(" characters")]
+            characters = self.queries.characters_of_element(element)
+            chars_label = f"{len(characters)} {element} characters"
 
-    def add_to_hp_sets(self):
-        char = self.char_combo.get()
-        if not char or char not in self.characters:
-            messagebox.showwarning("Warning", "Please select a valid character.")
+        return set_names, characters, sets_label, chars_label
+
+    def bulk_add(self):
+        targets = self.bulk_targets()
+        if targets is None:
             return
-            
-        priority_str = self.priority_combo.get()
-        if not priority_str:
+        set_names, characters, sets_label, chars_label = targets
+
+        priority = self.selected_priority()
+        if priority is None:
             messagebox.showwarning("Warning", "Please select a priority.")
             return
-            
-        # Extract priority value from the string
-        if "1.0" in priority_str:
-            priority = 1.0
-        elif "0.9" in priority_str:
-            priority = 0.9
-        else:
-            priority = 0.8
-        
-        # Find all sets with 2pc HP +20%
-        hp_sets = [name for name, data in self.artifact_sets.items() if data["2pc"] == "HP +20%"]
-        
-        # Add character to all HP +20% sets
-        for set_name in hp_sets:
-            set_data = self.artifact_sets[set_name]
-            if char not in set_data["recommended_for"]:
-                set_data["recommended_for"].append(char)
-            set_data["priority"][char] = priority
-        
-        self.on_set_select(None)  # Refresh display
-        messagebox.showinfo("Success", f"Added {char} to {len(hp_sets)} HP +20% sets!")
 
-    def remove_from_atk_sets(self):
-        char = self.char_combo.get()
-        if not char or char not in self.characters:
-            messagebox.showwarning("Warning", "Please select a valid character.")
+        where = priority_below(priority) if self.bulk_below_priority.get() else None
+        changed = self.queries.bulk_add(characters, set_names, priority, where)
+        if changed and not self.persist_changes():
             return
-        
-        # Find all sets with 2pc ATK +18%
-        atk_sets = [name for name, data in self.artifact_sets.items() if data["2pc"] == "ATK +18%"]
-        removed_count = 0
-        
-        # Remove character from all ATK +18% sets
-        for set_name in atk_sets:
-            set_data = self.artifact_sets[set_name]
-            if char in set_data["recommended_for"]:
-                set_data["recommended_for"].remove(char)
-                if char in set_data["priority"]:
-                    del set_data["priority"][char]
-                removed_count += 1
-        
-        self.on_set_select(None)  # Refresh display
-        if removed_count > 0:
-            messagebox.showinfo("Success", f"Removed {char} from {removed_count} ATK +18% sets!")
+
+        self.on_set_select(None)  # Refresh display once for the whole batch
+        if changed:
+            messagebox.showinfo(
+                "Success",
+                f"Added {chars_label} to {len({set_name for set_name, _ in changed})} {sets_label} "
+                f"({len(changed)} changes)!"
+            )
         else:
-            messagebox.showinfo("Info", f"{char} was not found in any ATK +18% sets.")
+            messagebox.showinfo("Info", f"{chars_label} already matched {sets_label}; nothing changed.")
 
-    def remove_from_em_sets(self):
-        char = self.char_combo.get()
-        if not char or char not in self.characters:
-            messagebox.showwarning("Warning", "Please select a valid character.")
+    def bulk_remove(self):
+        targets = self.bulk_targets()
+        if targets is None:
             return
-        
-        # Find all sets with 2pc EM +80
-        em_sets = [name for name, data in self.artifact_sets.items() if data["2pc"] == "Elemental Mastery +80"]
-        removed_count = 0
-        
-        # Remove character from all EM +80 sets
-        for set_name in em_sets:
-            set_data = self.artifact_sets[set_name]
-            if char in set_data["recommended_for"]:
-                set_data["recommended_for"].remove(char)
-                if char in set_data["priority"]:
-                    del set_data["priority"][char]
-                removed_count += 1
-        
-        self.on_set_select(None)  # Refresh display
-        if removed_count > 0:
-            messagebox.showinfo("Success", f"Removed {char} from {removed_count} EM +80 sets!")
-        else:
-            messagebox.showinfo("Info", f"{char} was not found in any EM +80 sets.")
+        set_names, characters, sets_label, chars_label = targets
 
-    def remove_from_hp_sets(self):
-        char = self.char_combo.get()
-        if not char or char not in self.characters:
-            messagebox.showwarning("Warning", "Please select a valid character.")
+        where = None
+        if self.bulk_below_priority.get():
+            priority = self.selected_priority()
+            if priority is None:
+                messagebox.showwarning("Warning", "Please select a priority.")
+                return
+            where = priority_below(priority)
+
+        removed = self.queries.bulk_remove(characters, set_names, where)
+        if removed and not self.persist_changes():
             return
-        
-        # Find all sets with 2pc HP +20%
-        hp_sets = [name for name, data in self.artifact_sets.items() if data["2pc"] == "HP +20%"]
-        removed_count = 0
-        
-        # Remove character from all HP +20% sets
-        for set_name in hp_sets:
-            set_data = self.artifact_sets[set_name]
-            if char in set_data["recommended_for"]:
-                set_data["recommended_for"].remove(char)
-                if char in set_data["priority"]:
-                    del set_data["priority"][char]
-                removed_count += 1
-        
-        self.on_set_select(None)  # Refresh display
-        if removed_count > 0:
-            messagebox.showinfo("Success", f"Removed {char} from {removed_count} HP +20% sets!")
+
+        self.on_set_select(None)  # Refresh display once for the whole batch
+        if removed:
+            messagebox.showinfo(
+                "Success",
+                f"Removed {chars_label} from {len({set_name for set_name, _ in removed})} {sets_label} "
+                f"({len(removed)} changes)!"
+            )
         else:
-            messagebox.showinfo("Info", f"{char} was not found in any HP +20% sets.")
+            messagebox.showinfo("Info", f"{chars_label} was not found in any {sets_label}.")
 
     def run(self):
         self.window.mainloop()
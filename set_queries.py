@@ -0,0 +1,182 @@
+import re
+
+# Priorities the configurator offers, best first
+PRIORITIES = (1.0, 0.9, 0.8)
+
+# Priority shown for characters recommended without an explicit one
+DEFAULT_PRIORITY = 0.8
+
+
+def normalize_bonus(text):
+    """Return a comparable form of a 2pc bonus string.
+
+    The set data is hand-edited, so the same bonus appears as 'ATK +18%',
+    'ATK+18%' or 'Hydro DMG bonus +15%.'; case, spacing around '+' and a
+    trailing period are ignored.
+    """
+    text = re.sub(r'\s*\+\s*', ' +', text.strip().rstrip('.').lower())
+    return ' '.join(text.split())
+
+
+def priority_value(set_data, character):
+    """Return a character's priority in a set as a float, or None if it is not recommended."""
+    if character not in set_data.get('recommended_for', []):
+        return None
+    return float(set_data.get('priority', {}).get(character, DEFAULT_PRIORITY))
+
+
+def priority_below(value):
+    """Pair predicate: the character is recommended for the set below priority value."""
+    def predicate(set_name, set_data, character):
+        priority = priority_value(set_data, character)
+        return priority is not None and priority < value
+    return predicate
+
+
+def priority_at_least(value):
+    """Pair predicate: the character is recommended for the set at priority value or better."""
+    def predicate(set_name, set_data, character):
+        priority = priority_value(set_data, character)
+        return priority is not None and priority >= value
+    return predicate
+
+
+class SetQueries:
+    """Indexed lookups and bulk edits over artifact_sets.json data.
+
+    Holds an index from normalized 2pc bonus to set names, from element to
+    characters and from every lowercase substring of a character name to
+    the matching names, so queries and the configurator's per-keystroke
+    filter are dictionary lookups. The 2pc bonuses and the roster do not
+    change while editing; call rebuild() if they do. Bulk edits modify
+    artifact_sets in place and return what changed, so callers can refresh
+    their display once per batch.
+    """
+
+    def __init__(self, artifact_sets, character_weights):
+        self.artifact_sets = artifact_sets
+        self.character_weights = character_weights
+        self.rebuild()
+
+    def rebuild(self):
+        # 2pc bonus -> set names, keeping the first spelling of each bonus for display
+        self.sets_by_bonus = {}
+        self.bonus_labels = {}
+        for set_name in sorted(self.artifact_sets):
+            bonus = self.artifact_sets[set_name].get('2pc', '')
+            key = normalize_bonus(bonus)
+            if not key:
+                continue
+            self.sets_by_bonus.setdefault(key, []).append(set_name)
+            self.bonus_labels.setdefault(key, bonus.strip().rstrip('.'))
+
+        self.characters = sorted(char['Character'].strip() for char in self.character_weights)
+        self.character_set = set(self.characters)
+        self.characters_by_lower = {char.lower(): char for char in self.characters}
+        self.characters_by_element = {}
+        for char in self.character_weights:
+            element = char.get('Element', '').strip()
+            if element:
+                self.characters_by_element.setdefault(element, []).append(char['Character'].strip())
+        for names in self.characters_by_element.values():
+            names.sort()
+
+        # Every substring of every lowercase name -> matching names in roster order
+        self.characters_by_substring = {}
+        self.characters_by_prefix = {}
+        for char in self.characters:
+            lower = char.lower()
+            substrings = {lower[start:end] for start in range(len(lower)) for end in range(start + 1, len(lower) + 1)}
+            for substring in substrings:
+                self.characters_by_substring.setdefault(substring, []).append(char)
+            for end in range(1, len(lower) + 1):
+                self.characters_by_prefix.setdefault(lower[:end], []).append(char)
+
+    def bonuses(self):
+        """Return the distinct 2pc bonuses as display labels, most common first."""
+        keys = sorted(self.sets_by_bonus, key=lambda key: (-len(self.sets_by_bonus[key]), key))
+        return [self.bonus_labels[key] for key in keys]
+
+    def sets_with_bonus(self, bonus):
+        """Return the names of the sets whose 2pc bonus matches bonus, in any spelling."""
+        return list(self.sets_by_bonus.get(normalize_bonus(bonus), []))
+
+    def sets_where(self, predicate):
+        """Return the names of the sets for which predicate(set_name, set_data) is true."""
+        return [name for name in sorted(self.artifact_sets) if predicate(name, self.artifact_sets[name])]
+
+    def sets_for_character(self, character):
+        """Return the names of the sets recommending character."""
+        return self.sets_where(lambda name, data: character in data.get('recommended_for', []))
+
+    def elements(self):
+        return sorted(self.characters_by_element)
+
+    def characters_of_element(self, element):
+        return list(self.characters_by_element.get(element, []))
+
+    def is_character(self, name):
+        return name in self.character_set
+
+    def search_characters(self, text):
+        """Return the characters whose name contains text (case-insensitive), in roster order."""
+        text = text.lower()
+        if not text:
+            return list(self.characters)
+        return list(self.characters_by_substring.get(text, []))
+
+    def characters_starting_with(self, text):
+        text = text.lower()
+        if not text:
+            return list(self.characters)
+        return list(self.characters_by_prefix.get(text, []))
+
+    def character_named(self, text):
+        """Return the character whose name equals text ignoring case, or None."""
+        return self.characters_by_lower.get(text.lower())
+
+    def bulk_add(self, characters, set_names, priority, where=None):
+        """Recommend every character for every named set at priority.
+
+        where(set_name, set_data, character), if given, limits the edit to
+        the pairs it accepts. Characters already recommended keep their
+        place and get the new priority. Returns the (set_name, character)
+        pairs that changed.
+        """
+        changed = []
+        for set_name in set_names:
+            set_data = self.artifact_sets[set_name]
+            recommended = set_data.setdefault('recommended_for', [])
+            priorities = set_data.setdefault('priority', {})
+            for char in characters:
+                if where is not None and not where(set_name, set_data, char):
+                    continue
+                if char in recommended and priorities.get(char) == priority:
+                    continue
+                if char not in recommended:
+                    recommended.append(char)
+                priorities[char] = priority
+                changed.append((set_name, char))
+        return changed
+
+    def bulk_remove(self, characters, set_names, where=None):
+        """Drop every character from every named set's recommendations.
+
+        where(set_name, set_data, character), if given, limits the edit to
+        the pairs it accepts. Returns the (set_name, character) pairs that
+        were removed.
+        """
+        removed = []
+        for set_name in set_names:
+            set_data = self.artifact_sets[set_name]
+            recommended = set_data.get('recommended_for', [])
+            priorities = set_data.get('priority', {})
+            for char in characters:
+                if char not in recommended:
+                    continue
+                if where is not None and not where(set_name, set_data, char):
+                    continue
+                recommended.remove(char)
+                priorities.pop(char, None)
+                removed.append((set_name, char))
+        return removed
@@ -0,0 +1,195 @@
+import json
+import os
+import tempfile
+
+SETS_PATH = 'artifact_sets.json'
+
+# Edits are appended to <sets file> + JOURNAL_SUFFIX until compacted
+JOURNAL_SUFFIX = '.journal'
+
+# Journal records written before the writer folds them into the sets file
+COMPACT_AFTER = 64
+
+
+def file_stamp(path):
+    """Return (inode, mtime, size) of a file, or None if it does not exist."""
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return stat.st_ino, stat.st_mtime_ns, stat.st_size
+
+
+def set_digests(artifact_sets):
+    return {name: json.dumps(data, sort_keys=True) for name, data in artifact_sets.items()}
+
+
+def fsync_directory(path):
+    # Makes a rename durable; not supported on every platform
+    try:
+        fd = os.open(os.path.dirname(os.path.abspath(path)), os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+def load_artifact_sets(path=SETS_PATH):
+    """Read the artifact set data including any journaled edits not yet compacted."""
+    return SetStore(path).load()
+
+
+class SetStore:
+    """artifact_sets.json with an append-only journal of per-set edits.
+
+    save() appends one JSON line per changed set ({"set": name, "data":
+    entry}, data null for a removed set) and fsyncs it, so an edit costs a
+    few hundred bytes instead of rewriting the file. compact() writes the
+    merged data to a temporary file, fsyncs it and renames it over the
+    sets file, then drops the journal. Replaying a journal record is
+    idempotent and a torn last line is ignored, so a crash at any point
+    leaves either the old or the new data.
+
+    refresh() lets a reader follow another process's edits: it reads only
+    the journal bytes appended since the last call (or everything, after a
+    compaction) and returns the names of the sets whose entry changed.
+    """
+
+    def __init__(self, path=SETS_PATH, compact_after=COMPACT_AFTER):
+        self.path = path
+        self.journal_path = path + JOURNAL_SUFFIX
+        self.compact_after = compact_after
+        self.artifact_sets = {}
+        self.digests = {}
+        self.base_stamp = None
+        self.journal_inode = None
+        self.journal_offset = 0
+        self.journal_records = 0
+
+    def load(self):
+        """Read the sets file and replay the journal; returns the merged set data."""
+        # Stamp before reading, so an edit made meanwhile is picked up by the next refresh
+        stamp = file_stamp(self.path)
+        with open(self.path, 'r') as f:
+            self.artifact_sets = json.load(f)
+        self.base_stamp = stamp
+        self.journal_inode = None
+        self.journal_offset = 0
+        self.journal_records = 0
+        self._replay()
+        self.digests = set_digests(self.artifact_sets)
+        return self.artifact_sets
+
+    def _replay(self):
+        try:
+            with open(self.journal_path, 'rb') as f:
+                # journal_offset only means something within this file
+                self.journal_inode = os.fstat(f.fileno()).st_ino
+                f.seek(self.journal_offset)
+                data = f.read()
+        except FileNotFoundError:
+            return
+        # Only complete lines; a partial one is still being written or was torn by a crash
+        end = data.rfind(b'\n') + 1
+        for line in data[:end].splitlines():
+            try:
+                record = json.loads(line)
+            except ValueError:
+                continue
+            if record.get('data') is None:
+                self.artifact_sets.pop(record['set'], None)
+            else:
+                self.artifact_sets[record['set']] = record['data']
+            self.journal_records += 1
+        self.journal_offset += end
+
+    def refresh(self):
+        """Pick up edits written by another process; returns the names of the changed sets.
+
+        self.artifact_sets is updated in place.
+        """
+        journal_stamp = file_stamp(self.journal_path)
+        journal_inode, _, journal_size = journal_stamp if journal_stamp else (None, None, 0)
+        previous = self.digests
+        replaced = self.journal_offset and journal_inode != self.journal_inode
+        if file_stamp(self.path) != self.base_stamp or journal_size < self.journal_offset or replaced:
+            # Compacted, rewritten or the journal replaced (it may since have grown
+            # past our offset): start over from the sets file, keeping the same dict
+            current = self.artifact_sets
+            self.load()
+            current.clear()
+            current.update(self.artifact_sets)
+            self.artifact_sets = current
+        elif journal_size > self.journal_offset:
+            self._replay()
+            self.digests = set_digests(self.artifact_sets)
+        else:
+            return set()
+        return {name for name in set(previous) | set(self.digests) if previous.get(name) != self.digests.get(name)}
+
+    def save(self, artifact_sets):
+        """Journal the sets whose entry differs from the last load or save.
+
+        Returns the names of the changed sets. Compacts once the journal
+        holds compact_after records.
+        """
+        digests = set_digests(artifact_sets)
+        changed = sorted(name for name in set(self.digests) | set(digests) if self.digests.get(name) != digests.get(name))
+        if not changed:
+            return []
+
+        lines = ''.join(
+            json.dumps({'set': name, 'data': artifact_sets.get(name)}) + '\n' for name in changed
+        ).encode('utf-8')
+        with open(self.journal_path, 'a+b') as f:
+            # Terminate a line torn by a crash so it cannot swallow the next record
+            if f.seek(0, os.SEEK_END):
+                f.seek(-1, os.SEEK_END)
+                if f.read(1) != b'\n':
+                    lines = b'\n' + lines
+            f.write(lines)
+            f.flush()
+            os.fsync(f.fileno())
+            # The end of what was written, whatever the offset was before
+            self.journal_inode = os.fstat(f.fileno()).st_ino
+            self.journal_offset = f.tell()
+        self.journal_records += len(changed)
+        self.artifact_sets = artifact_sets
+        self.digests = digests
+
+        if self.journal_records >= self.compact_after:
+            self.compact()
+        return changed
+
+    def compact(self, artifact_sets=None):
+        """Write the merged set data to the sets file atomically and clear the journal."""
+        if artifact_sets is not None:
+            self.artifact_sets = artifact_sets
+            self.digests = set_digests(artifact_sets)
+        fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(self.path)), suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'w') as f:
+                json.dump(self.artifact_sets, f, indent=4)
+                f.flush()
+                os.fsync(f.fileno())
+            # mkstemp creates the file private; keep the sets file's permissions
+            if os.path.exists(self.path):
+                os.chmod(temp_path, os.stat(self.path).st_mode & 0o777)
+            os.replace(temp_path, self.path)
+        except BaseException:
+            os.remove(temp_path)
+            raise
+        fsync_directory(self.path)
+        # The replaced file already holds every journaled edit
+        try:
+            os.remove(self.journal_path)
+        except FileNotFoundError:
+            pass
+        self.base_stamp = file_stamp(self.path)
+        self.journal_inode = None
+        self.journal_offset = 0
+        self.journal_records = 0
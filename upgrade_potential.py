@@ -0,0 +1,344 @@
+import numpy as np
+
+from instrumentation import instruments
+from scoring_engine import RANKS, STAT_KEY_MAP, SUBSTAT_ODDS, SUBSTAT_ROLLS
+
+# Roll tiers in tenths of the maximum roll (70%, 80%, 90% and 100%); each
+# upgrade adds one of them, with equal odds, to a random substat line
+ROLL_TIERS = (7, 8, 9, 10)
+
+# Maximum level and roll size (relative to a 5-star roll) per rarity; one
+# upgrade happens every 4 levels
+MAX_LEVELS = {5: 20, 4: 16}
+ROLL_SCALES = {5: 1.0, 4: 0.8}
+
+MAX_SUBSTATS = 4
+
+# Substat odds and maximum 5-star roll by calculator stat name
+NEW_LINE_ODDS = {STAT_KEY_MAP[key]: odds for key, odds in SUBSTAT_ODDS.items()}
+MAX_ROLLS = {STAT_KEY_MAP[key]: rolls[-1] for key, rolls in SUBSTAT_ROLLS.items()}
+
+# Outcome x character cells evaluated per step of the rank probability pass
+POTENTIAL_CHUNK_CELLS = 2_000_000
+
+# (rolls, new lines) -> (units, probabilities), see roll_outcomes
+OUTCOME_TABLES = {}
+
+
+def remaining_upgrades(artifact):
+    """Return how many upgrades an artifact has left (0 for unknown rarities or levels)."""
+    level = artifact.get('level')
+    rarity = artifact.get('rarity', 5)
+    if not isinstance(level, int) or rarity not in MAX_LEVELS:
+        return 0
+    return max(0, MAX_LEVELS[rarity] // 4 - max(0, level) // 4)
+
+
+def roll_outcomes(rolls, new_lines=0, lines=None):
+    """Return the exact outcome distribution of the remaining upgrades.
+
+    The first new_lines upgrades each open a missing substat line (the last
+    slots, in order) with one roll; the others add a roll to one of the
+    MAX_SUBSTATS lines with equal odds. Returns (units, probabilities):
+    an outcomes x lines array of the tenths of a maximum roll each line
+    gains, and the probability of each outcome. lines, a tuple of line
+    indexes, keeps only those lines and merges outcomes that differ
+    elsewhere. Tables are built by repeated convolution once and cached.
+    """
+    key = (rolls, new_lines, lines)
+    table = OUTCOME_TABLES.get(key)
+    if table is not None:
+        return table
+
+    if lines is not None:
+        units, probabilities = roll_outcomes(rolls, new_lines)
+        units, inverse = np.unique(units[:, list(lines)], axis=0, return_inverse=True)
+        table = (units, np.bincount(inverse.ravel(), weights=probabilities, minlength=len(units)))
+        OUTCOME_TABLES[key] = table
+        return table
+
+    outcomes = {(0,) * MAX_SUBSTATS: 1.0}
+    for step in range(rolls):
+        if step < new_lines:
+            slots = [MAX_SUBSTATS - new_lines + step]
+        else:
+            slots = range(MAX_SUBSTATS)
+        odds = 1.0 / (len(slots) * len(ROLL_TIERS))
+        grown = {}
+        for units, probability in outcomes.items():
+            for slot in slots:
+                for tier in ROLL_TIERS:
+                    outcome = units[:slot] + (units[slot] + tier,) + units[slot + 1:]
+                    grown[outcome] = grown.get(outcome, 0.0) + probability * odds
+        outcomes = grown
+
+    table = (np.array(list(outcomes), dtype=np.float64).reshape(-1, MAX_SUBSTATS),
+             np.array(list(outcomes.values())))
+    OUTCOME_TABLES[key] = table
+    return table
+
+
+def new_line_candidates(artifact, count):
+    """Return [(stats, probability)] for the substats the next count new lines could get.
+
+    New lines never repeat the main stat or an existing substat, and are
+    drawn by NEW_LINE_ODDS in order.
+    """
+    candidates = [((), 1.0)]
+    taken = {artifact.get('main_stat', '')} | {substat['stat'] for substat in artifact.get('substats', [])}
+    for _ in range(count):
+        grown = []
+        for stats, probability in candidates:
+            odds = {stat: weight for stat, weight in NEW_LINE_ODDS.items() if stat not in taken and stat not in stats}
+            total = sum(odds.values())
+            for stat, weight in odds.items():
+                grown.append((stats + (stat,), probability * weight / total))
+        candidates = grown
+    return candidates
+
+
+def potential_rows(engine, artifacts):
+    """Expand artifacts into one row per possible set of new substat lines.
+
+    Returns (rows, weights, slot_stats, slot_units, table_keys): the artifact
+    index and probability of each row, the stat ID of each of its
+    MAX_SUBSTATS lines, the substat value one tenth of a maximum roll adds
+    to each line (relative to the stat's theoretical best) and the
+    (rolls, new lines) outcome table that applies.
+    """
+    unit_values = np.zeros(engine.unknown_stat + 1)
+    for stat, stat_id in engine.stat_index.items():
+        if stat in MAX_ROLLS:
+            unit_values[stat_id] = MAX_ROLLS[stat] / 10 / engine.max_values[stat_id]
+
+    rows, weights, slot_stats, table_keys = [], [], [], []
+    for row, artifact in enumerate(artifacts):
+        stats = [engine.stat_index.get(substat['stat'], engine.unknown_stat)
+                 for substat in artifact.get('substats', [])]
+        rolls = remaining_upgrades(artifact)
+        if len(stats) > MAX_SUBSTATS:
+            # Not a real artifact; score it as it is
+            stats, rolls = stats[:MAX_SUBSTATS], 0
+        new_lines = min(MAX_SUBSTATS - len(stats), rolls)
+        scale = ROLL_SCALES.get(artifact.get('rarity', 5), 0.0)
+        for new_stats, probability in new_line_candidates(artifact, new_lines):
+            line_stats = stats + [engine.stat_index.get(stat, engine.unknown_stat) for stat in new_stats]
+            line_stats += [engine.unknown_stat] * (MAX_SUBSTATS - len(line_stats))
+            rows.append(row)
+            weights.append(probability)
+            slot_stats.append(line_stats)
+            table_keys.append((rolls, new_lines, scale))
+
+    slot_stats = np.array(slot_stats, dtype=np.intp).reshape(-1, MAX_SUBSTATS)
+    scales = np.array([scale for _, _, scale in table_keys])
+    # Lines that are empty at the end get no value, whatever their stat ID
+    slot_units = unit_values[slot_stats] * scales[:, None]
+    return (np.array(rows, dtype=np.intp), np.array(weights), slot_stats, slot_units,
+            [(rolls, new_lines) for rolls, new_lines, _ in table_keys])
+
+
+def reach_conditions(scores, substat_scores, max_possible, is_correct_set, has_correct_main):
+    """Return whether each rank or better is reached, as a (..., 4) bool array (SS, S, A, B).
+
+    Mirrors classify_ranks: every rank's condition implies the next one's.
+    """
+    substat_quality = np.divide(
+        substat_scores / 100, max_possible,
+        out=np.zeros_like(substat_scores), where=max_possible > 0
+    )
+    correct_both = is_correct_set & has_correct_main
+    return np.stack([
+        (scores >= 160) & correct_both & (substat_quality >= 0.7),
+        (scores >= 120) & correct_both,
+        (scores >= 80) & (is_correct_set | has_correct_main),
+        scores >= 40
+    ], axis=-1)
+
+
+def reach_thresholds(base_scores, substat_scores, multipliers, max_possible, is_correct_set, has_correct_main):
+    """Return the score each rank or better needs to gain, as a (..., 4) array (SS, S, A, B).
+
+    The threshold form of reach_conditions; np.inf marks a rank that no
+    gain reaches.
+    """
+    def needed(score):
+        final = np.full_like(base_scores, np.inf)
+        np.divide(score, multipliers, out=final, where=multipliers > 0)
+        return final - base_scores
+
+    quality = np.full_like(base_scores, np.inf)
+    np.subtract(70 * max_possible, substat_scores, out=quality, where=max_possible > 0)
+    correct_both = is_correct_set & has_correct_main
+    return np.stack([
+        np.where(correct_both, np.maximum(needed(160), quality), np.inf),
+        np.where(correct_both, needed(120), np.inf),
+        np.where(is_correct_set | has_correct_main, needed(80), np.inf),
+        needed(40)
+    ], axis=-1)
+
+
+def potential_features(engine, artifacts):
+    """Build the per-row tables the potential evaluation works on.
+
+    Rows are those of potential_rows. Returns a dict of rows x characters
+    arrays (current 'main_scores', 'substat_scores', 'multipliers',
+    'is_correct_set', 'has_correct_main', final 'max_possible', and the
+    'expected', 'low' and 'high' score gained from the remaining upgrades),
+    the rows x lines x characters 'gains' per tenth of a maximum roll, and
+    'rows', 'weights' and 'table_keys'.
+    """
+    main_ids, flat_main, set_ids, relative_values, substat_counts = engine.artifact_features(artifacts)
+    rows, weights, slot_stats, slot_units, table_keys = potential_rows(engine, artifacts)
+
+    # Current scores per row, exactly as the scoring pass computes them
+    main_scores = np.where(flat_main[:, None], 100.0, engine.main_score_weights[main_ids])[rows]
+    substat_scores = (relative_values @ engine.sub_score_weights)[rows]
+    # New lines count towards the best substat score the quality is measured against
+    new_line_counts = np.zeros_like(substat_counts[rows])
+    for row, (rolls, new_lines) in enumerate(table_keys):
+        for stat_id in slot_stats[row, MAX_SUBSTATS - new_lines:]:
+            new_line_counts[row, stat_id] += 1
+
+    # Score gained per tenth of a maximum roll on each line: rows x lines x characters
+    gains = slot_units[:, :, None] * engine.sub_score_weights[slot_stats]
+
+    expected = np.empty_like(substat_scores)
+    low = np.empty_like(substat_scores)
+    high = np.empty_like(substat_scores)
+    for key in set(table_keys):
+        rolls, new_lines = key
+        group = np.flatnonzero([table_key == key for table_key in table_keys])
+        units, probabilities = roll_outcomes(rolls, new_lines)
+        group_gains = gains[group]
+        expected[group] = np.einsum('j,rjc->rc', probabilities @ units, group_gains)
+
+        # Exact bounds: every upgrade adds its best (or worst) roll
+        lowest = np.minimum(group_gains * ROLL_TIERS[0], group_gains * ROLL_TIERS[-1])
+        highest = np.maximum(group_gains * ROLL_TIERS[0], group_gains * ROLL_TIERS[-1])
+        free_rolls = rolls - new_lines
+        forced = slice(MAX_SUBSTATS - new_lines, MAX_SUBSTATS)
+        low[group] = free_rolls * lowest.min(axis=1) + lowest[:, forced].sum(axis=1)
+        high[group] = free_rolls * highest.max(axis=1) + highest[:, forced].sum(axis=1)
+
+    return {
+        'rows': rows,
+        'weights': weights,
+        'table_keys': table_keys,
+        'main_scores': main_scores,
+        'substat_scores': substat_scores,
+        'multipliers': engine.set_multipliers[set_ids][rows],
+        'is_correct_set': engine.recommended_sets[set_ids][rows],
+        'has_correct_main': (engine.main_weights[main_ids] > 0)[rows],
+        'max_possible': (substat_counts[rows] + new_line_counts) @ engine.sub_weights,
+        'gains': gains,
+        'expected': expected,
+        'low': low,
+        'high': high
+    }
+
+
+def gained_conditions(features, gained):
+    """reach_conditions for every row and character after gaining the given score."""
+    substat_scores = features['substat_scores'] + gained
+    return reach_conditions(
+        (features['main_scores'] + substat_scores) * features['multipliers'], substat_scores,
+        features['max_possible'], features['is_correct_set'], features['has_correct_main']
+    )
+
+
+def upgrade_potential(engine, artifacts):
+    """Evaluate the remaining upgrades of a batch of artifacts against every character.
+
+    Returns (expected_scores, reach):
+      expected_scores - artifacts x characters expected final scores
+      reach           - artifacts x characters x len(RANKS) probabilities of
+                        finishing at each rank or better (the C column is 1)
+
+    Fully upgraded artifacts (and dicts without a 'level') get their current
+    score and rank. The expectation is exact: the score is linear in the
+    substat values, so only the mean of each outcome table is needed. Rank
+    probabilities come from the precomputed outcome tables; characters whose
+    rank is settled by the lowest and highest possible outcome are not
+    evaluated per outcome.
+    """
+    with instruments.timer("potential.upgrade_potential"):
+        features = potential_features(engine, artifacts)
+        rows, weights, table_keys = features['rows'], features['weights'], features['table_keys']
+        gains, main_scores, substat_scores = features['gains'], features['main_scores'], features['substat_scores']
+        multipliers, max_possible = features['multipliers'], features['max_possible']
+        is_correct_set, has_correct_main = features['is_correct_set'], features['has_correct_main']
+
+        # Scores and quality only grow with the gained value, so a rank reached
+        # with the lowest outcome is certain and one missed with the highest is out of reach
+        row_reach = gained_conditions(features, features['low']).astype(np.float64)
+        unsettled = row_reach != gained_conditions(features, features['high'])
+        for key in set(table_keys):
+            group = np.array([table_key == key for table_key in table_keys])
+            row_ids, columns = np.nonzero(unsettled.any(axis=2) & group[:, None])
+            if not len(row_ids):
+                continue
+            cell_gains = gains[row_ids, :, columns]
+            thresholds = reach_thresholds(
+                main_scores[row_ids, columns] + substat_scores[row_ids, columns],
+                substat_scores[row_ids, columns], multipliers[row_ids, columns], max_possible[row_ids, columns],
+                is_correct_set[row_ids, columns], has_correct_main[row_ids, columns]
+            )
+            cell_unsettled = unsettled[row_ids, columns]
+            values = row_reach[row_ids, columns]
+            # Lines a character gains nothing from are merged out of the outcome table
+            patterns = (cell_gains != 0) @ (1 << np.arange(MAX_SUBSTATS))
+            for pattern in np.unique(patterns).tolist():
+                lines = tuple(line for line in range(MAX_SUBSTATS) if pattern >> line & 1)
+                units, probabilities = roll_outcomes(*key, lines)
+                step = max(1, POTENTIAL_CHUNK_CELLS // len(units))
+                # Usually only one rank per character is undecided; evaluate just those
+                for rank in range(thresholds.shape[1]):
+                    selected = np.flatnonzero((patterns == pattern) & cell_unsettled[:, rank])
+                    for start in range(0, len(selected), step):
+                        part = selected[start:start + step]
+                        gained = units @ cell_gains[part][:, lines].T  # outcomes x cells
+                        values[part, rank] = np.dot(probabilities, gained >= thresholds[part, rank])
+            row_reach[row_ids, columns] = values
+            instruments.count("potential cells evaluated", len(row_ids))
+
+        expected_scores = np.zeros((len(artifacts), len(engine.characters)))
+        final_scores = (main_scores + substat_scores + features['expected']) * multipliers
+        np.add.at(expected_scores, rows, weights[:, None] * final_scores)
+        reach = np.zeros((len(artifacts), len(engine.characters), len(RANKS)))
+        np.add.at(reach, rows, weights[:, None, None] * np.concatenate(
+            [row_reach, np.ones(row_reach.shape[:2] + (1,))], axis=2))
+    instruments.count("potential artifacts", len(artifacts))
+    return expected_scores, np.minimum(reach, 1.0)
+
+
+def best_ranks(engine, artifacts):
+    """Return the best rank code (index into RANKS) each artifact can still reach, per character.
+
+    An artifacts x characters array: the rank of the best possible outcome
+    of the remaining upgrades, i.e. the current rank for finished pieces.
+    Unlike upgrade_potential this needs no outcome tables.
+    """
+    features = potential_features(engine, artifacts)
+    reached = gained_conditions(features, features['high'])
+    # First rank reached, or C when none is
+    codes = np.where(reached.any(axis=2), reached.argmax(axis=2), len(RANKS) - 1).astype(np.int8)
+    ranks = np.full((len(artifacts), len(engine.characters)), len(RANKS) - 1, dtype=np.int8)
+    np.minimum.at(ranks, features['rows'], codes)
+    return ranks
+
+
+def potential_rankings(engine, artifacts, k=5):
+    """Return, per artifact, the k best (character, expected score, reach) tuples.
+
+    Characters are ordered by expected final score; reach maps each rank to
+    the probability of finishing at that rank or better.
+    """
+    expected_scores, reach = upgrade_potential(engine, artifacts)
+    results = []
+    for row_scores, row_reach in zip(expected_scores, reach):
+        order = np.argsort(-row_scores, kind='stable')[:k].tolist()
+        results.append([
+            (engine.characters[col], float(row_scores[col]), dict(zip(RANKS, row_reach[col].tolist())))
+            for col in order
+        ])
+    return results